@@ -3,7 +3,14 @@ from sqlalchemy.orm import sessionmaker
 from config.settings import settings
 from database.models import Base
 
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db(db_engine=None):
@@ -13,9 +20,13 @@ def init_db(db_engine=None):
     Base.metadata.create_all(bind=db_engine)
 
 def get_db():
-    """Get database session."""
+    """Get a request-scoped session, committed once if the request succeeds."""
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
\ No newline at end of file
@@ -12,6 +12,9 @@ class Settings:
 
     # Database Configuration
     DATABASE_URL: str = config("DATABASE_URL", default="postgresql://admin:admin123@db:5432/syriagpt")
+    DB_POOL_SIZE: int = config("DB_POOL_SIZE", default=20, cast=int)
+    DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", default=40, cast=int)
+    DB_POOL_RECYCLE: int = config("DB_POOL_RECYCLE", default=3600, cast=int)
 
     # Security Configuration
     SECRET_KEY: str = config("SECRET_KEY", default="3e8c7f51e5bd5dac5ba401b1125d43fb")
@@ -22,6 +25,13 @@ class Settings:
         "EMAIL_VERIFICATION_EXPIRE_HOURS", default=24, cast=int
     )
     PASSWORD_RESET_EXPIRE_HOURS: int = config("PASSWORD_RESET_EXPIRE_HOURS", default=1, cast=int)
+    BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=11, cast=int)
+
+    # Rate limiting for sign-in, password reset and OAuth callbacks
+    RATE_LIMIT_BURST: int = config("RATE_LIMIT_BURST", default=10, cast=int)
+    RATE_LIMIT_PER_MINUTE: int = config("RATE_LIMIT_PER_MINUTE", default=5, cast=int)
+    # Hour of day (UTC) at which expired reset tokens and 2FA codes are purged
+    TOKEN_CLEANUP_HOUR: int = config("TOKEN_CLEANUP_HOUR", default=3, cast=int)
 
     # Email Configuration
     SMTP_SERVER: str = config("SMTP_SERVER", default="smtp.gmail.com")
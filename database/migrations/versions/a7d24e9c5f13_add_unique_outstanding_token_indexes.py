@@ -0,0 +1,44 @@
+"""Allow one outstanding reset token and 2FA code per user
+
+Revision ID: a7d24e9c5f13
+Revises: f3b8c61d0e27
+Create Date: 2026-10-16 14:48:12.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d24e9c5f13'
+down_revision: Union[str, None] = 'f3b8c61d0e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('password_resets', 'two_factor_auths')
+
+
+def upgrade() -> None:
+    # Keep only each user's newest outstanding record so the unique index can build
+    for table in TABLES:
+        op.execute(f"""
+            UPDATE {table} SET is_used = TRUE
+            WHERE is_used IS NOT TRUE
+              AND id NOT IN (
+                  SELECT DISTINCT ON (user_id) id FROM {table}
+                  WHERE is_used IS NOT TRUE
+                  ORDER BY user_id, created_at DESC
+              )
+        """)
+
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'uq_{table}_user_unused', table, ['user_id'], unique=True, postgresql_where=sa.text('is_used IS NOT TRUE'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'uq_{table}_user_unused', table_name=table, postgresql_concurrently=True)
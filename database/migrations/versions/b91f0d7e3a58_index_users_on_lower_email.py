@@ -0,0 +1,54 @@
+"""Index users on lower(email) for case-insensitive lookups
+
+Revision ID: b91f0d7e3a58
+Revises: a7d24e9c5f13
+Create Date: 2026-10-16 16:21:45.338190
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91f0d7e3a58'
+down_revision: Union[str, None] = 'a7d24e9c5f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        # Accounts that differ only by case cannot be merged automatically, so
+        # they are reported for manual cleanup before the unique build fails
+        conflicts = op.get_bind().execute(sa.text(
+            "SELECT lower(email) FROM users GROUP BY 1 HAVING count(*) > 1"
+        )).scalars().all()
+        if conflicts:
+            raise RuntimeError(
+                "Cannot create ix_users_email_lower: these emails are used by more than one "
+                "account when compared case-insensitively: " + ", ".join(conflicts)
+            )
+
+        # A failed concurrent build leaves an invalid index behind, which would
+        # block a retry, so it is dropped first
+        invalid = op.get_bind().execute(sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = 'ix_users_email_lower' AND NOT pg_index.indisvalid"
+        )).first()
+        if invalid:
+            with op.get_context().autocommit_block():
+                op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
+
+    # The exact-match lookups ix_users_email served are covered by the unique
+    # constraint on email, so it is replaced rather than kept alongside
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True, if_not_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_users_email', table_name='users', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email', 'users', ['email'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_users_email_lower', table_name='users', postgresql_concurrently=True)
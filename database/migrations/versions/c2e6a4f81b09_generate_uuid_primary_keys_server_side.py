@@ -0,0 +1,30 @@
+"""Generate UUID primary keys server-side
+
+Revision ID: c2e6a4f81b09
+Revises: b91f0d7e3a58
+Create Date: 2026-10-16 16:58:20.617443
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e6a4f81b09'
+down_revision: Union[str, None] = 'b91f0d7e3a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('users', 'email_verifications', 'password_resets', 'refresh_tokens', 'two_factor_auths')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=None)
@@ -0,0 +1,40 @@
+"""Store password reset tokens as SHA-256 hashes
+
+Revision ID: c4e2b7a91d3f
+Revises: 46bf21b0562f
+Create Date: 2026-10-16 10:12:41.527113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e2b7a91d3f'
+down_revision: Union[str, None] = '46bf21b0562f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('password_resets', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    op.execute(
+        "UPDATE password_resets "
+        "SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    op.alter_column('password_resets', 'token_hash', nullable=False)
+    op.create_index('ix_password_resets_token_hash', 'password_resets', ['token_hash'], unique=True)
+    op.drop_index('ix_password_resets_token', table_name='password_resets')
+    op.drop_column('password_resets', 'token')
+
+
+def downgrade() -> None:
+    # Raw tokens cannot be recovered from their hashes, so outstanding reset
+    # links stop working after a downgrade
+    op.add_column('password_resets', sa.Column('token', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('password_resets_token_key', 'password_resets', ['token'])
+    op.create_index('ix_password_resets_token', 'password_resets', ['token'], unique=False)
+    op.drop_index('ix_password_resets_token_hash', table_name='password_resets')
+    op.drop_column('password_resets', 'token_hash')
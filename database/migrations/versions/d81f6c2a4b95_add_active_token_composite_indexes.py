@@ -0,0 +1,35 @@
+"""Add composite indexes for active token lookups per user
+
+Revision ID: d81f6c2a4b95
+Revises: c4e2b7a91d3f
+Create Date: 2026-10-16 11:02:17.830452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f6c2a4b95'
+down_revision: Union[str, None] = 'c4e2b7a91d3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block; the (user_id, ...)
+    # composites replace the single-column user_id indexes as their prefix
+    with op.get_context().autocommit_block():
+        op.create_index('ix_password_resets_user_active', 'password_resets', ['user_id', 'is_used', 'expires_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_two_factor_auths_user_active', 'two_factor_auths', ['user_id', 'is_used', 'expires_at'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_password_resets_user_id', table_name='password_resets', postgresql_concurrently=True)
+        op.drop_index('ix_two_factor_auths_user_id', table_name='two_factor_auths', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_two_factor_auths_user_id', 'two_factor_auths', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_password_resets_user_id', 'password_resets', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_two_factor_auths_user_active', table_name='two_factor_auths', postgresql_concurrently=True)
+        op.drop_index('ix_password_resets_user_active', table_name='password_resets', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""Store password reset token hashes as bytes
+
+Revision ID: d8f3a1c5e7b2
+Revises: c2e6a4f81b09
+Create Date: 2026-10-16 18:12:44.301927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3a1c5e7b2'
+down_revision: Union[str, None] = 'c2e6a4f81b09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The stored digests are converted in place, so outstanding links stay valid
+    op.alter_column(
+        'password_resets', 'token_hash',
+        type_=sa.LargeBinary(length=32),
+        existing_type=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="decode(token_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'password_resets', 'token_hash',
+        type_=sa.String(length=64),
+        existing_type=sa.LargeBinary(length=32),
+        existing_nullable=False,
+        postgresql_using="encode(token_hash, 'hex')",
+    )
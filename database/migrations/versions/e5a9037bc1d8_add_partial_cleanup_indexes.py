@@ -0,0 +1,34 @@
+"""Add partial indexes for token cleanup predicates
+
+Revision ID: e5a9037bc1d8
+Revises: d81f6c2a4b95
+Create Date: 2026-10-16 11:24:03.114729
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9037bc1d8'
+down_revision: Union[str, None] = 'd81f6c2a4b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('password_resets', 'two_factor_auths')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_unused_expires_at', table, ['expires_at'], unique=False, postgresql_where=sa.text('is_used IS NOT TRUE'), postgresql_concurrently=True)
+            op.create_index(f'ix_{table}_used_created_at', table, ['created_at'], unique=False, postgresql_where=sa.text('is_used IS TRUE'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(f'ix_{table}_used_created_at', table_name=table, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_unused_expires_at', table_name=table, postgresql_concurrently=True)
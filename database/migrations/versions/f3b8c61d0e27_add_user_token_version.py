@@ -0,0 +1,26 @@
+"""Add token_version to users
+
+Revision ID: f3b8c61d0e27
+Revises: e5a9037bc1d8
+Create Date: 2026-10-16 14:02:37.481206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c61d0e27'
+down_revision: Union[str, None] = 'e5a9037bc1d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -1,13 +1,15 @@
-import uuid
 from sqlalchemy import (
     Column,
     String,
     Boolean,
+    Integer,
     DateTime,
     Text,
+    LargeBinary,
     ForeignKey,
     Index,
     create_engine,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -20,7 +22,7 @@ Base = declarative_base()
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String, nullable=True)
     phone_number = Column(String(20), unique=True, nullable=True)
@@ -33,26 +35,34 @@ class User(Base):
     google_id = Column(String(255), unique=True, nullable=True)
     facebook_id = Column(String(255), unique=True, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Bumped to invalidate every refresh token issued to the user at once
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
+    # Relationships - child rows are removed by the ON DELETE CASCADE foreign
+    # keys, so deleting a user does not load these collections first
     email_verifications = relationship(
-        "EmailVerification", back_populates="user", cascade="all, delete-orphan"
+        "EmailVerification", back_populates="user", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     password_resets = relationship(
-        "PasswordReset", back_populates="user", cascade="all, delete-orphan"
+        "PasswordReset", back_populates="user", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     refresh_tokens = relationship(
-        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+        "RefreshToken", back_populates="user", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     two_factor_auths = relationship(
-        "TwoFactorAuth", back_populates="user", cascade="all, delete-orphan"
+        "TwoFactorAuth", back_populates="user", cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     __table_args__ = (
-        Index("ix_users_email", "email"),
+        # Emails match case-insensitively, so uniqueness is enforced on lower(email)
+        Index("ix_users_email_lower", func.lower(email), unique=True),
         Index("ix_users_google_id", "google_id"),
         Index("ix_users_facebook_id", "facebook_id"),
         Index("ix_users_phone_number", "phone_number"),
@@ -62,7 +72,7 @@ class User(Base):
 class EmailVerification(Base):
     __tablename__ = "email_verifications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     token = Column(String(255), unique=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -80,9 +90,9 @@ class EmailVerification(Base):
 class PasswordReset(Base):
     __tablename__ = "password_resets"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token = Column(String(255), unique=True, nullable=False)
+    token_hash = Column(LargeBinary(32), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     is_used = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -90,15 +100,29 @@ class PasswordReset(Base):
     user = relationship("User", back_populates="password_resets")
 
     __table_args__ = (
-        Index("ix_password_resets_user_id", "user_id"),
-        Index("ix_password_resets_token", "token"),
+        Index("ix_password_resets_user_active", "user_id", "is_used", "expires_at"),
+        # Partial indexes covering the two arms of the cleanup predicate
+        Index(
+            "ix_password_resets_unused_expires_at", "expires_at",
+            postgresql_where=text("is_used IS NOT TRUE"),
+        ),
+        Index(
+            "ix_password_resets_used_created_at", "created_at",
+            postgresql_where=text("is_used IS TRUE"),
+        ),
+        # At most one outstanding record per user; the upsert in create targets it
+        Index(
+            "uq_password_resets_user_unused", "user_id", unique=True,
+            postgresql_where=text("is_used IS NOT TRUE"),
+        ),
+        Index("ix_password_resets_token_hash", "token_hash", unique=True),
     )
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     token = Column(Text, unique=True, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -116,7 +140,7 @@ class RefreshToken(Base):
 class TwoFactorAuth(Base):
     __tablename__ = "two_factor_auths"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     code_hash = Column(String, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -126,7 +150,21 @@ class TwoFactorAuth(Base):
     user = relationship("User", back_populates="two_factor_auths")
 
     __table_args__ = (
-        Index("ix_two_factor_auths_user_id", "user_id"),
+        Index("ix_two_factor_auths_user_active", "user_id", "is_used", "expires_at"),
+        # Partial indexes covering the two arms of the cleanup predicate
+        Index(
+            "ix_two_factor_auths_unused_expires_at", "expires_at",
+            postgresql_where=text("is_used IS NOT TRUE"),
+        ),
+        Index(
+            "ix_two_factor_auths_used_created_at", "created_at",
+            postgresql_where=text("is_used IS TRUE"),
+        ),
+        # At most one outstanding record per user; the upsert in create targets it
+        Index(
+            "uq_two_factor_auths_user_unused", "user_id", unique=True,
+            postgresql_where=text("is_used IS NOT TRUE"),
+        ),
     )
 
 
@@ -32,6 +32,7 @@ class User:
     two_factor_enabled: bool = False
     status: UserStatus = UserStatus.PENDING_VERIFICATION
     is_active: bool = True
+    token_version: int = 0
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -22,3 +22,8 @@ class ITwoFactorAuthRepository(ABC):
     async def mark_code_as_used(self, code_id: UUID) -> None:
         """Mark a 2FA code as used."""
         pass
+
+    @abstractmethod
+    def cleanup_expired(self) -> int:
+        """Delete expired or used 2FA codes and return how many were removed."""
+        pass
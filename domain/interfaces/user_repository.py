@@ -15,6 +15,11 @@ class IUserRepository(ABC):
         """Create a new user."""
         pass
     
+    @abstractmethod
+    async def create_if_absent(self, user_data: Dict[str, Any]) -> Optional[User]:
+        """Create a new user unless a unique field is already taken."""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
@@ -35,6 +40,13 @@ class IUserRepository(ABC):
         """Get user by Facebook ID."""
         pass
     
+    @abstractmethod
+    async def get_by_email_or_oauth_id(
+        self, email: Optional[str], provider_name: str, provider_id: str
+    ) -> Optional[User]:
+        """Get user by email address or OAuth provider ID, preferring the email match."""
+        pass
+    
     @abstractmethod
     async def get_by_phone_number(self, phone_number: str) -> Optional[User]:
         """Get user by phone number."""
@@ -45,11 +57,28 @@ class IUserRepository(ABC):
         """Update user data."""
         pass
     
+    @abstractmethod
+    async def increment_token_version(self, user_id: UUID) -> bool:
+        """Increment the user's token version."""
+        pass
+    
+    @abstractmethod
+    async def reset_password(self, user_id: UUID, password_hash: str) -> bool:
+        """Set a new password hash and increment the user's token version."""
+        pass
+    
     @abstractmethod
     async def delete(self, user_id: UUID) -> bool:
         """Delete user."""
         pass
     
+    @abstractmethod
+    async def find_registration_conflict(
+        self, email: str, phone_number: Optional[str] = None
+    ) -> Optional[str]:
+        """Return "email" or "phone_number" if either is already registered."""
+        pass
+    
     @abstractmethod
     async def email_exists(self, email: str) -> bool:
         """Check if email already exists."""
@@ -2,15 +2,16 @@
 
 import random
 import string
-from typing import Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from domain.entities import User, UserStatus
 from domain.interfaces import IUserRepository, IOAuthProvider, ITwoFactorAuthRepository
 from infrastructure.services.password_service import PasswordService
 from infrastructure.services.token_service import TokenService
 from infrastructure.services.email_service import EmailService
+from infrastructure.database.repositories.password_reset_repository import PasswordResetRepository
 
 
 class AuthUseCases:
@@ -22,40 +23,70 @@ class AuthUseCases:
         password_service: PasswordService,
         token_service: TokenService,
         email_service: EmailService,
-        two_factor_auth_repository: ITwoFactorAuthRepository
+        two_factor_auth_repository: ITwoFactorAuthRepository,
+        password_reset_repository: PasswordResetRepository,
+        email_dispatcher: Optional[Callable[..., None]] = None
     ):
         self.user_repository = user_repository
         self.password_service = password_service
         self.token_service = token_service
         self.email_service = email_service
         self.two_factor_auth_repository = two_factor_auth_repository
+        self.password_reset_repository = password_reset_repository
+        self.email_dispatcher = email_dispatcher
+    
+    def _issue_tokens(self, user: User) -> Dict[str, Any]:
+        """Build the sign-in response with a fresh access and refresh token pair."""
+        access_token, refresh_token = self.token_service.create_token_pair(str(user.id), user.token_version)
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": self.token_service.get_access_token_expiry(),
+        }
+    
+    async def _send_email(self, send: Callable[..., Awaitable[None]], *args: Any) -> None:
+        """Hand an email to the dispatcher to send after the response, or send it now."""
+        if self.email_dispatcher is None:
+            await send(*args)
+        else:
+            self.email_dispatcher(send, *args)
+    
+    async def _raise_registration_conflict(self, user_data: Dict[str, Any]) -> None:
+        """Raise if the signup's email or phone number is already registered."""
+        conflict = await self.user_repository.find_registration_conflict(
+            user_data["email"], user_data.get("phone_number")
+        )
+        if conflict == "email":
+            raise ValueError("Email already registered")
+        if conflict == "phone_number":
+            raise ValueError("Phone number already registered")
     
     async def register_user(self, user_data: Dict[str, Any]) -> Dict[str, str]:
         """Register a new user."""
-        # Validate email uniqueness
-        if await self.user_repository.email_exists(user_data["email"]):
-            raise ValueError("Email already registered")
-        
-        # Validate phone uniqueness if provided
-        if user_data.get("phone_number"):
-            if await self.user_repository.phone_exists(user_data["phone_number"]):
-                raise ValueError("Phone number already registered")
+        # Reject taken emails and phone numbers with one query before paying for bcrypt
+        await self._raise_registration_conflict(user_data)
         
         # Hash password
         if "password" in user_data:
-            user_data["password_hash"] = self.password_service.hash_password(user_data.pop("password"))
+            user_data["password_hash"] = await self.password_service.hash_password_async(user_data.pop("password"))
         
         # Set default values
         user_data.setdefault("status", UserStatus.PENDING_VERIFICATION.value)
         user_data.setdefault("is_active", True)
         
-        # Create user
-        user = await self.user_repository.create(user_data)
+        # Create user; uniqueness is enforced by the insert itself, so concurrent
+        # signups for the same email cannot both succeed
+        user = await self.user_repository.create_if_absent(user_data)
+        if user is None:
+            # Lost a race with a concurrent signup after the check above
+            await self._raise_registration_conflict(user_data)
+            raise ValueError("User already exists")
         
         # Send verification email if email provided
         if user.email and not user.is_email_verified:
             verification_token = self.token_service.generate_verification_token(str(user.id))
-            await self.email_service.send_verification_email(user.email, verification_token)
+            await self._send_email(self.email_service.send_verification_email, user.email, verification_token)
         
         return {
             "message": "User registered successfully. Please check your email for verification.",
@@ -66,31 +97,38 @@ class AuthUseCases:
         """Authenticate user with email and password."""
         # Get user
         user = await self.user_repository.get_by_email(email)
-        if not user:
+        if not user or not user.password_hash:
+            # Spend the same hashing time as a real check, so the response time
+            # does not reveal whether the email belongs to an account
+            await self.password_service.dummy_verify_async()
             raise ValueError("Invalid email or password")
 
         # Verify password
-        if not user.password_hash or not self.password_service.verify_password(
-            password, user.password_hash
-        ):
+        if not await self.password_service.verify_password_async(password, user.password_hash):
             raise ValueError("Invalid email or password")
 
         # Check if user can login
         if not user.can_login:
             raise ValueError("Account is not active or verified")
 
+        # Upgrade legacy hashes while the plain password is at hand
+        if self.password_service.needs_rehash(user.password_hash):
+            await self.user_repository.update(
+                user.id, {"password_hash": await self.password_service.hash_password_async(password)}
+            )
+
         # Handle 2FA if enabled
         if user.two_factor_enabled:
             # 1. Generate 6-digit code
             tfa_code = "".join(random.choices(string.digits, k=6))
-            code_hash = self.password_service.hash_password(tfa_code)
-            expires_at = datetime.utcnow() + timedelta(minutes=10)
+            code_hash = await self.password_service.hash_password_async(tfa_code)
+            expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
 
             # 2. Save hashed code and expiry to the database
             await self.two_factor_auth_repository.create_2fa_code(user.id, code_hash, expires_at)
             
             # 3. Send code to user's email
-            await self.email_service.send_2fa_code(user.email, tfa_code)
+            await self._send_email(self.email_service.send_2fa_code, user.email, tfa_code)
             
             # 4. Generate a temporary 2FA token
             tfa_token = self.token_service.create_2fa_token(str(user.id))
@@ -101,20 +139,12 @@ class AuthUseCases:
             }
 
         # Generate final tokens if 2FA is not enabled
-        access_token = self.token_service.create_access_token({"sub": str(user.id)})
-        refresh_token = self.token_service.create_refresh_token(str(user.id))
-
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": self.token_service.get_access_token_expiry(),
-        }
+        return self._issue_tokens(user)
 
     async def verify_2fa_code(self, tfa_token: str, code: str) -> Dict[str, Any]:
         """Verify the 2FA code and return final tokens."""
         # 1. Verify the 2FA token
-        payload = self.token_service.verify_token(tfa_token, token_type="2fa")
+        payload = self.token_service.verify_2fa_token(tfa_token)
         if not payload:
             raise ValueError("Invalid or expired 2FA token")
 
@@ -126,22 +156,18 @@ class AuthUseCases:
             raise ValueError("Invalid or expired 2FA code")
 
         # 3. Verify the code
-        if not self.password_service.verify_password(code, tfa_code_obj.code_hash):
+        if not await self.password_service.verify_password_async(code, tfa_code_obj.code_hash):
             raise ValueError("Invalid 2FA code")
 
         # 4. Mark the code as used
         await self.two_factor_auth_repository.mark_code_as_used(tfa_code_obj.id)
 
         # 5. Generate final tokens
-        access_token = self.token_service.create_access_token({"sub": str(user_id)})
-        refresh_token = self.token_service.create_refresh_token(str(user_id))
+        user = await self.user_repository.get_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
 
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": self.token_service.get_access_token_expiry(),
-        }
+        return self._issue_tokens(user)
     
     async def authenticate_with_oauth(
         self, 
@@ -160,15 +186,7 @@ class AuthUseCases:
             raise ValueError(f"Insufficient user information from {provider_name}")
         
         # Find existing user
-        user = None
-        if email:
-            user = await self.user_repository.get_by_email(email)
-        
-        if not user:
-            if provider_name == "google":
-                user = await self.user_repository.get_by_google_id(provider_id)
-            elif provider_name == "facebook":
-                user = await self.user_repository.get_by_facebook_id(provider_id)
+        user = await self.user_repository.get_by_email_or_oauth_id(email, provider_name, provider_id)
         
         if user:
             # Update existing user
@@ -210,15 +228,7 @@ class AuthUseCases:
             raise ValueError("Account is not active")
         
         # Generate tokens
-        access_token = self.token_service.create_access_token({"sub": str(user.id)})
-        refresh_token = self.token_service.create_refresh_token(str(user.id))
-        
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": self.token_service.get_access_token_expiry()
-        }
+        return self._issue_tokens(user)
     
     async def verify_email(self, token: str) -> Dict[str, str]:
         """Verify user email with token."""
@@ -227,18 +237,15 @@ class AuthUseCases:
         if not user_id:
             raise ValueError("Invalid or expired verification token")
         
-        # Get user and verify email
-        user = await self.user_repository.get_by_id(UUID(user_id))
-        if not user:
-            raise ValueError("User not found")
-        
-        # Update user verification status
+        # Update user verification status; a missing user updates no row
         update_data = {
             "is_email_verified": True,
             "status": UserStatus.ACTIVE.value
         }
         
-        await self.user_repository.update(user.id, update_data)
+        user = await self.user_repository.update(UUID(user_id), update_data)
+        if not user:
+            raise ValueError("User not found")
         
         return {"message": "Email verified successfully"}
     
@@ -254,11 +261,11 @@ class AuthUseCases:
             raise ValueError("User not found")
         
         # Verify current password
-        if not user.password_hash or not self.password_service.verify_password(current_password, user.password_hash):
+        if not user.password_hash or not await self.password_service.verify_password_async(current_password, user.password_hash):
             raise ValueError("Invalid current password")
         
         # Hash new password
-        new_password_hash = self.password_service.hash_password(new_password)
+        new_password_hash = await self.password_service.hash_password_async(new_password)
         
         # Update password
         await self.user_repository.update(user_id, {"password_hash": new_password_hash})
@@ -270,21 +277,33 @@ class AuthUseCases:
         if not user:
             raise ValueError("No account found with this email")
 
-        reset_token = self.token_service.create_password_reset_token(user.id)
-        await self.email_service.send_password_reset_email(user.email, reset_token)
+        # The JWT exp claim has whole-second precision, so the row's expiry is
+        # truncated to match and the token and row expire at the same instant
+        expires_at = (
+            datetime.now(timezone.utc) + timedelta(minutes=self.token_service.password_reset_expire_minutes)
+        ).replace(microsecond=0)
+        reset_token = self.token_service.create_password_reset_token(user.id, expires_at=expires_at)
+        self.password_reset_repository.create({
+            "user_id": user.id,
+            "token": reset_token,
+            "expires_at": expires_at,
+            "is_used": False
+        })
+        await self._send_email(self.email_service.send_password_reset_email, user.email, reset_token)
         return {"message": "Password reset instructions sent to your email"}
     
     async def confirm_password_reset(self, token: str, new_password: str) -> Dict[str, str]:
         user_id = self.token_service.verify_password_reset_token(token)
-        if not user_id:
+        # consume() is the one-shot check itself, so it cannot be deferred to a
+        # background task without letting a replayed link through in the meantime
+        if not user_id or not self.password_reset_repository.consume(token):
             raise ValueError("Invalid or expired password reset token")
 
-        user = await self.user_repository.get_by_id(UUID(user_id))
-        if not user:
+        new_password_hash = await self.password_service.hash_password_async(new_password)
+        if not await self.user_repository.reset_password(UUID(user_id), new_password_hash):
             raise ValueError("User not found")
-
-        new_password_hash = self.password_service.hash_password(new_password)
-        await self.user_repository.update(user.id, {"password_hash": new_password_hash, "token_version": user.token_version + 1})
+        # Any other reset links still in the user's inbox must stop working
+        self.password_reset_repository.revoke_user_tokens(UUID(user_id))
         return {"message": "Password has been reset successfully"}
     
     async def sign_out_user(self, user_id: UUID, refresh_token: str) -> Dict[str, str]:
@@ -292,9 +311,7 @@ class AuthUseCases:
         return {"message": "Signed out from this device"}
     
     async def sign_out_all_devices(self, user_id: UUID) -> Dict[str, str]:
-        user = await self.user_repository.get_by_id(user_id)
-        if not user:
+        if not await self.user_repository.increment_token_version(user_id):
             raise ValueError("User not found")
 
-        await self.user_repository.update(user_id, {"token_version": user.token_version + 1})
         return {"message": "Signed out from all devices"}
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Housekeeping for short-lived authentication records."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .repositories import PasswordResetRepository, TwoFactorAuthRepositoryImpl
+
+logger = logging.getLogger(__name__)
+
+# Every worker process schedules the daily cleanup; this transaction-scoped
+# advisory lock lets only one of them run the DELETEs
+_CLEANUP_LOCK_KEY = 0x5379_7269_6147_5054
+
+
+def cleanup_expired_tokens(db: Session) -> Optional[Dict[str, int]]:
+    """Delete expired or used reset tokens and 2FA codes in one transaction.
+
+    Returns None without deleting anything if another worker holds the lock.
+    """
+    try:
+        if not db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _CLEANUP_LOCK_KEY}
+        ).scalar():
+            db.rollback()
+            return None
+        removed = {
+            "password_resets": PasswordResetRepository(db).cleanup_expired(),
+            "two_factor_auths": TwoFactorAuthRepositoryImpl(db).cleanup_expired(),
+        }
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return removed
+
+
+def _run_cleanup(session_factory: Callable[[], Session]) -> Optional[Dict[str, int]]:
+    """Run cleanup_expired_tokens on a session of its own."""
+    db = session_factory()
+    try:
+        return cleanup_expired_tokens(db)
+    finally:
+        db.close()
+
+
+def _seconds_until_hour(hour: int) -> float:
+    """Seconds from now until the next occurrence of ``hour``:00 UTC."""
+    now = datetime.now(timezone.utc)
+    next_run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+async def run_daily_token_cleanup(session_factory: Callable[[], Session], hour: int) -> None:
+    """Run cleanup_expired_tokens once a day at ``hour`` UTC until cancelled."""
+    while True:
+        await asyncio.sleep(_seconds_until_hour(hour))
+        try:
+            # The DELETEs run on a synchronous session, so they go to a worker
+            # thread instead of stalling every request on the event loop
+            removed = await asyncio.to_thread(_run_cleanup, session_factory)
+            if removed is None:
+                logger.info("Expired token cleanup skipped; another worker is running it")
+            else:
+                logger.info("Expired token cleanup removed %s", removed)
+        except Exception:
+            # A failed run is retried at the next window; keep the loop alive
+            logger.exception("Expired token cleanup failed")
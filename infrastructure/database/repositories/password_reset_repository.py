@@ -1,29 +1,74 @@
+import hashlib
+import threading
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from uuid import UUID
 from database.models import PasswordReset
+from .single_use_token_mixin import SingleUseTokenMixin
 from datetime import datetime
 
-class PasswordResetRepository:
+# A rejected reset token (used, expired or revoked) can never become valid
+# again, so replays are answered from this process-wide set without a query
+_REJECTED_TOKEN_CACHE_SIZE = 4096
+_rejected_tokens: dict[bytes, None] = {}
+_rejected_tokens_lock = threading.Lock()
+
+
+def _hash_token(token: str) -> bytes:
+    """Tokens are stored and looked up by their raw 32-byte SHA-256 digest."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class PasswordResetRepository(SingleUseTokenMixin):
     """Repository to handle password reset tokens."""
 
+    model_class = PasswordReset
+
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, data: dict) -> PasswordReset:
-        """Create a new password reset record."""
-        record = PasswordReset(**data)
-        self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
-        return record
+    def create(self, data: dict) -> None:
+        """Issue a reset token, replacing any outstanding one; stored only as a hash."""
+        data = dict(data)
+        data["token_hash"] = _hash_token(data.pop("token"))
+        self.db.execute(self._upsert_outstanding_statement(data))
 
     def get_by_token(self, token: str) -> PasswordReset | None:
         """Retrieve password reset record by token."""
-        return self.db.query(PasswordReset).filter_by(token=token).first()
+        return self.db.query(PasswordReset).filter_by(token_hash=_hash_token(token)).first()
 
     def mark_used(self, token_id: UUID) -> None:
         """Mark the token as used."""
-        record = self.db.query(PasswordReset).get(token_id)
-        if record:
-            record.is_used = True
-            self.db.commit()
+        self.db.execute(self._mark_used_statement(token_id))
+
+    def consume(self, token: str) -> UUID | None:
+        """Atomically mark an unused, unexpired token as used and return its user_id."""
+        token_hash = _hash_token(token)
+        if token_hash in _rejected_tokens:
+            return None
+
+        user_id = self.db.execute(
+            update(PasswordReset)
+            .where(
+                PasswordReset.token_hash == token_hash,
+                PasswordReset.is_used.isnot(True),
+                PasswordReset.expires_at > func.now(),
+            )
+            .values(is_used=True)
+            .returning(PasswordReset.user_id)
+        ).scalar_one_or_none()
+        if user_id is None:
+            with _rejected_tokens_lock:
+                if len(_rejected_tokens) >= _REJECTED_TOKEN_CACHE_SIZE:
+                    _rejected_tokens.pop(next(iter(_rejected_tokens)))
+                _rejected_tokens[token_hash] = None
+        return user_id
+
+    def revoke_user_tokens(self, user_id: UUID) -> int:
+        """Mark all of a user's unused reset tokens as used; returns rows updated."""
+        return self.db.execute(self._revoke_user_statement(user_id)).rowcount
+
+    def cleanup_expired(self) -> int:
+        """Delete expired or used reset tokens in one statement; returns rows removed."""
+        return self.db.execute(self._cleanup_statement()).rowcount
@@ -0,0 +1,63 @@
+"""Statements shared by repositories of single-use token tables."""
+
+from typing import Any, Dict
+from uuid import UUID
+from sqlalchemy import Delete, Update, and_, delete, or_, update
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.sql import func
+
+
+class SingleUseTokenMixin:
+    """Builds statements for tables with ``user_id``, ``is_used`` and ``expires_at`` columns."""
+
+    model_class = None
+
+    def _upsert_outstanding_statement(self, values: Dict[str, Any]) -> Insert:
+        """INSERT a record, replacing the user's outstanding one in the same statement.
+
+        Relies on the partial unique index on ``user_id`` for unused records.
+        """
+        model = self.model_class
+        replaced = {key: value for key, value in values.items() if key != "user_id"}
+        return (
+            insert(model)
+            .values(**values)
+            .on_conflict_do_update(
+                index_elements=[model.user_id],
+                index_where=model.is_used.isnot(True),
+                set_={**replaced, "created_at": func.now()},
+            )
+        )
+
+    def _mark_used_statement(self, record_id: UUID) -> Update:
+        """UPDATE marking a single record as used by primary key."""
+        return (
+            update(self.model_class)
+            .where(self.model_class.id == record_id)
+            .values(is_used=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _revoke_user_statement(self, user_id: UUID) -> Update:
+        """UPDATE marking all of a user's unused records as used."""
+        return (
+            update(self.model_class)
+            .where(self.model_class.user_id == user_id, self.model_class.is_used.isnot(True))
+            .values(is_used=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _cleanup_statement(self) -> Delete:
+        """DELETE for expired or used records.
+
+        The two disjoint arms each match one of the partial cleanup indexes.
+        """
+        model = self.model_class
+        return (
+            delete(model)
+            .where(or_(
+                and_(model.is_used.isnot(True), model.expires_at <= func.now()),
+                model.is_used.is_(True),
+            ))
+            .execution_options(synchronize_session=False)
+        )
@@ -2,38 +2,47 @@
 
 from typing import Dict, Any
 from uuid import UUID
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from database.models import TwoFactorAuth
 from domain.interfaces.two_factor_auth_repository import ITwoFactorAuthRepository
-from datetime import datetime
+from .single_use_token_mixin import SingleUseTokenMixin
 
-class TwoFactorAuthRepositoryImpl(ITwoFactorAuthRepository):
+# A user has at most one unused code, so this is a single probe of the partial
+# unique index on (user_id) WHERE is_used IS NOT TRUE
+_OUTSTANDING_CODE_BY_USER_ID = select(TwoFactorAuth).where(
+    TwoFactorAuth.user_id == bindparam("user_id"),
+    TwoFactorAuth.is_used.isnot(True),
+    TwoFactorAuth.expires_at > func.now(),
+)
+
+
+class TwoFactorAuthRepositoryImpl(SingleUseTokenMixin, ITwoFactorAuthRepository):
     """Implementation of the TwoFactorAuth repository."""
 
+    model_class = TwoFactorAuth
+
     def __init__(self, session: Session):
         self.session = session
 
     async def create_2fa_code(self, user_id: UUID, code_hash: str, expires_at: Any) -> None:
-        """Create a new 2FA code."""
-        new_code = TwoFactorAuth(
-            user_id=user_id,
-            code_hash=code_hash,
-            expires_at=expires_at
-        )
-        self.session.add(new_code)
-        self.session.commit()
+        """Create a new 2FA code, replacing the user's outstanding one."""
+        self.session.execute(self._upsert_outstanding_statement({
+            "user_id": user_id,
+            "code_hash": code_hash,
+            "expires_at": expires_at,
+            "is_used": False,
+        }))
 
     async def get_2fa_code_by_user_id(self, user_id: UUID) -> Any:
-        """Get the latest 2FA code for a user."""
-        return self.session.query(TwoFactorAuth).filter(
-            TwoFactorAuth.user_id == user_id,
-            TwoFactorAuth.expires_at > datetime.utcnow(),
-            TwoFactorAuth.is_used == False
-        ).order_by(TwoFactorAuth.created_at.desc()).first()
+        """Get the user's outstanding, unexpired 2FA code."""
+        return self.session.scalars(_OUTSTANDING_CODE_BY_USER_ID, {"user_id": user_id}).first()
 
     async def mark_code_as_used(self, code_id: UUID) -> None:
         """Mark a 2FA code as used."""
-        code = self.session.query(TwoFactorAuth).filter(TwoFactorAuth.id == code_id).first()
-        if code:
-            code.is_used = True
-            self.session.commit()
+        self.session.execute(self._mark_used_statement(code_id))
+
+    def cleanup_expired(self) -> int:
+        """Delete expired or used 2FA codes and return how many were removed."""
+        return self.session.execute(self._cleanup_statement()).rowcount
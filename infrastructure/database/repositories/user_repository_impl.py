@@ -3,12 +3,35 @@
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, bindparam, case, exists, false, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 from domain.entities import User, UserStatus
 from domain.interfaces import IUserRepository
 from database.models import User as UserModel
 
+# Lookups on the sign-in and OAuth paths are built once; each call only binds values
+_USER_BY_EMAIL = select(UserModel).where(func.lower(UserModel.email) == bindparam("email"))
+_USER_BY_GOOGLE_ID = select(UserModel).where(UserModel.google_id == bindparam("google_id"))
+_USER_BY_FACEBOOK_ID = select(UserModel).where(UserModel.facebook_id == bindparam("facebook_id"))
+
+
+def _by_email_or_provider_id(provider_column):
+    """One lookup matching either key, preferring the email match if both hit."""
+    email_matches = func.lower(UserModel.email) == bindparam("email")
+    return (
+        select(UserModel)
+        .where(or_(email_matches, provider_column == bindparam("provider_id")))
+        .order_by(case((email_matches, 0), else_=1))
+        .limit(1)
+    )
+
+
+_USER_BY_EMAIL_OR_PROVIDER_ID = {
+    "google": _by_email_or_provider_id(UserModel.google_id),
+    "facebook": _by_email_or_provider_id(UserModel.facebook_id),
+}
+
 
 class UserRepositoryImpl(IUserRepository):
     """SQLAlchemy implementation of user repository."""
@@ -35,6 +58,7 @@ class UserRepositoryImpl(IUserRepository):
             two_factor_enabled=user_model.two_factor_enabled or False,
             status=UserStatus(user_model.status) if user_model.status else UserStatus.PENDING_VERIFICATION,
             is_active=user_model.is_active if user_model.is_active is not None else True,
+            token_version=user_model.token_version or 0,
             created_at=user_model.created_at,
             updated_at=user_model.updated_at
         )
@@ -54,16 +78,20 @@ class UserRepositoryImpl(IUserRepository):
             "is_phone_verified": user.is_phone_verified,
             "two_factor_enabled": user.two_factor_enabled,
             "status": user.status.value if isinstance(user.status, UserStatus) else user.status,
-            "is_active": user.is_active
+            "is_active": user.is_active,
+            "token_version": user.token_version
         }
     
-    async def create(self, user_data: Dict[str, Any]) -> User:
-        """Create a new user."""
-        # Set defaults
+    def _apply_create_defaults(self, user_data: Dict[str, Any]) -> None:
+        """Fill in the flags a new user starts with."""
         user_data.setdefault('is_email_verified', False)
         user_data.setdefault('is_phone_verified', False)
         user_data.setdefault('two_factor_enabled', False)
         user_data.setdefault('is_active', True)
+    
+    async def create(self, user_data: Dict[str, Any]) -> User:
+        """Create a new user."""
+        self._apply_create_defaults(user_data)
         
         user_model = UserModel(**user_data)
         self.db.add(user_model)
@@ -71,24 +99,49 @@ class UserRepositoryImpl(IUserRepository):
         
         return self._model_to_entity(user_model)
     
+    async def create_if_absent(self, user_data: Dict[str, Any]) -> Optional[User]:
+        """Create a new user unless a unique field is taken; returns None on conflict."""
+        self._apply_create_defaults(user_data)
+        
+        user_model = self.db.scalars(
+            insert(UserModel)
+            .values(**user_data)
+            .on_conflict_do_nothing()
+            .returning(UserModel)
+        ).one_or_none()
+        return self._model_to_entity(user_model) if user_model else None
+    
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
-        user_model = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        user_model = self.db.get(UserModel, user_id)
         return self._model_to_entity(user_model) if user_model else None
     
     async def get_by_email(self, email: str) -> Optional[User]:
-        """Get user by email address."""
-        user_model = self.db.query(UserModel).filter(UserModel.email == email).first()
+        """Get user by email address, ignoring case."""
+        user_model = self.db.scalars(_USER_BY_EMAIL, {"email": email.lower()}).first()
         return self._model_to_entity(user_model) if user_model else None
     
     async def get_by_google_id(self, google_id: str) -> Optional[User]:
         """Get user by Google ID."""
-        user_model = self.db.query(UserModel).filter(UserModel.google_id == google_id).first()
+        user_model = self.db.scalars(_USER_BY_GOOGLE_ID, {"google_id": google_id}).first()
         return self._model_to_entity(user_model) if user_model else None
     
     async def get_by_facebook_id(self, facebook_id: str) -> Optional[User]:
         """Get user by Facebook ID."""
-        user_model = self.db.query(UserModel).filter(UserModel.facebook_id == facebook_id).first()
+        user_model = self.db.scalars(_USER_BY_FACEBOOK_ID, {"facebook_id": facebook_id}).first()
+        return self._model_to_entity(user_model) if user_model else None
+    
+    async def get_by_email_or_oauth_id(
+        self, email: Optional[str], provider_name: str, provider_id: str
+    ) -> Optional[User]:
+        """Get user by email or OAuth provider ID in one query; email match wins."""
+        statement = _USER_BY_EMAIL_OR_PROVIDER_ID.get(provider_name)
+        if statement is None:
+            return await self.get_by_email(email) if email else None
+        
+        user_model = self.db.scalars(
+            statement, {"email": email.lower() if email else None, "provider_id": provider_id}
+        ).first()
         return self._model_to_entity(user_model) if user_model else None
     
     async def get_by_phone_number(self, phone_number: str) -> Optional[User]:
@@ -97,20 +150,42 @@ class UserRepositoryImpl(IUserRepository):
         return self._model_to_entity(user_model) if user_model else None
     
     async def update(self, user_id: UUID, update_data: Dict[str, Any]) -> Optional[User]:
-        """Update user data."""
-        user_model = self.db.query(UserModel).filter(UserModel.id == user_id).first()
-        if not user_model:
-            return None
-        
-        for key, value in update_data.items():
-            if hasattr(user_model, key):
-                setattr(user_model, key, value)
+        """Update user data in a single UPDATE ... RETURNING round trip."""
+        values = {key: value for key, value in update_data.items() if hasattr(UserModel, key)}
+        if not values:
+            return await self.get_by_id(user_id)
         
-        return self._model_to_entity(user_model)
+        user_model = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(**values)
+            .returning(UserModel)
+        ).scalar_one_or_none()
+        return self._model_to_entity(user_model) if user_model else None
+    
+    async def increment_token_version(self, user_id: UUID) -> bool:
+        """Bump the user's token version in place, revoking all refresh tokens."""
+        result = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(token_version=UserModel.token_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
+    async def reset_password(self, user_id: UUID, password_hash: str) -> bool:
+        """Replace the password hash and revoke refresh tokens in one UPDATE."""
+        result = self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(password_hash=password_hash, token_version=UserModel.token_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
     
     async def delete(self, user_id: UUID) -> bool:
         """Delete user."""
-        user_model = self.db.query(UserModel).filter(UserModel.id == user_id).first()
+        user_model = self.db.get(UserModel, user_id)
         if not user_model:
             return False
         
@@ -118,21 +193,38 @@ class UserRepositoryImpl(IUserRepository):
         self.db.flush()
         return True
     
+    def _exists(self, criterion) -> bool:
+        """Check for a matching user with SELECT EXISTS, without loading the row."""
+        return self.db.query(self.db.query(UserModel).filter(criterion).exists()).scalar()
+    
+    async def find_registration_conflict(
+        self, email: str, phone_number: Optional[str] = None
+    ) -> Optional[str]:
+        """Check email and phone number in one SELECT; returns the field already taken."""
+        email_taken = exists().where(func.lower(UserModel.email) == email.lower())
+        phone_taken = exists().where(UserModel.phone_number == phone_number) if phone_number else false()
+        row = self.db.execute(select(email_taken, phone_taken)).one()
+        if row[0]:
+            return "email"
+        if row[1]:
+            return "phone_number"
+        return None
+    
     async def email_exists(self, email: str) -> bool:
-        """Check if email already exists."""
-        return self.db.query(UserModel).filter(UserModel.email == email).first() is not None
+        """Check if email already exists, ignoring case."""
+        return self._exists(func.lower(UserModel.email) == email.lower())
     
     async def phone_exists(self, phone_number: str) -> bool:
         """Check if phone number already exists."""
-        return self.db.query(UserModel).filter(UserModel.phone_number == phone_number).first() is not None
+        return self._exists(UserModel.phone_number == phone_number)
     
     async def google_id_exists(self, google_id: str) -> bool:
         """Check if Google ID already exists."""
-        return self.db.query(UserModel).filter(UserModel.google_id == google_id).first() is not None
+        return self._exists(UserModel.google_id == google_id)
     
     async def facebook_id_exists(self, facebook_id: str) -> bool:
         """Check if Facebook ID already exists."""
-        return self.db.query(UserModel).filter(UserModel.facebook_id == facebook_id).first() is not None
+        return self._exists(UserModel.facebook_id == facebook_id)
     
     async def get_active_users(self, skip: int = 0, limit: int = 100) -> List[User]:
         """Get active users."""
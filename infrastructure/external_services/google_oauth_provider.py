@@ -1,13 +1,18 @@
 """Google OAuth provider implementation."""
 
-import httpx
+import re
+import time
 from urllib.parse import urlencode
 from typing import Dict, Any
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+from google.auth import jwt as google_jwt
 
 from domain.interfaces import IOAuthProvider
 from config.settings import settings
+from .http_client import get_http_client
+
+_GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+_DEFAULT_CERTS_TTL = 3600
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
 
 
 class GoogleOAuthProvider(IOAuthProvider):
@@ -17,9 +22,8 @@ class GoogleOAuthProvider(IOAuthProvider):
         self.client_id = settings.GOOGLE_CLIENT_ID
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = settings.GOOGLE_REDIRECT_URI
-    
-    def get_authorization_url(self) -> str:
-        """Get Google OAuth authorization URL."""
+        
+        # Every parameter is fixed per process, so the URL is built once
         base_url = "https://accounts.google.com/o/oauth2/v2/auth"
         
         params = {
@@ -32,57 +36,80 @@ class GoogleOAuthProvider(IOAuthProvider):
             "state": "google_oauth_security_state"
         }
         
-        return f"{base_url}?{urlencode(params)}"
+        self._authorization_url = f"{base_url}?{urlencode(params)}"
+        
+        # Google's signing certificates, reused until their Cache-Control max-age
+        self._certs: Dict[str, str] = {}
+        self._certs_expires_at = 0.0
+    
+    def get_authorization_url(self) -> str:
+        """Get Google OAuth authorization URL."""
+        return self._authorization_url
+    
+    async def _get_certs(self) -> Dict[str, str]:
+        """Get Google's ID token signing certificates, fetching only when stale."""
+        if time.monotonic() < self._certs_expires_at:
+            return self._certs
+        
+        response = await get_http_client().get(_GOOGLE_CERTS_URL)
+        if response.status_code != 200:
+            raise ValueError("Failed to fetch Google signing certificates")
+        
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        ttl = int(match.group(1)) if match else _DEFAULT_CERTS_TTL
+        self._certs = response.json()
+        self._certs_expires_at = time.monotonic() + ttl
+        return self._certs
     
     async def exchange_code_for_user_info(self, auth_code: str) -> Dict[str, Any]:
         """Exchange authorization code for user information."""
         if not self.client_id or not self.client_secret:
             raise ValueError("Google OAuth not configured")
         
-        async with httpx.AsyncClient() as client:
-            # Exchange code for tokens
-            token_response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": auth_code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": self.redirect_uri,
-                }
-            )
-            
-            if token_response.status_code != 200:
-                error_data = token_response.json()
-                error_detail = error_data.get('error', 'Unknown error')
-                if 'error_description' in error_data:
-                    error_detail += f": {error_data['error_description']}"
-                raise ValueError(f"Google OAuth error: {error_detail}")
-            
-            token_data = token_response.json()
-            id_token_str = token_data.get("id_token")
-            
-            if not id_token_str:
-                raise ValueError("No ID token received from Google")
-            
-            # Verify and decode ID token
-            idinfo = id_token.verify_oauth2_token(
-                id_token_str, 
-                google_requests.Request(), 
-                self.client_id
-            )
-            
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                raise ValueError('Invalid token issuer')
-            
-            return {
-                "id": idinfo.get('sub'),
-                "email": idinfo.get('email'),
-                "first_name": idinfo.get('given_name'),
-                "last_name": idinfo.get('family_name'),
-                "email_verified": idinfo.get('email_verified', False)
+        client = get_http_client()
+        # Exchange code for tokens
+        token_response = await client.post(
+            "https://oauth2.googleapis.com/token",
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": auth_code,
+                "grant_type": "authorization_code",
+                "redirect_uri": self.redirect_uri,
             }
-    
+        )
+        
+        if token_response.status_code != 200:
+            error_data = token_response.json()
+            error_detail = error_data.get('error', 'Unknown error')
+            if 'error_description' in error_data:
+                error_detail += f": {error_data['error_description']}"
+            raise ValueError(f"Google OAuth error: {error_detail}")
+        
+        token_data = token_response.json()
+        id_token_str = token_data.get("id_token")
+        
+        if not id_token_str:
+            raise ValueError("No ID token received from Google")
+        
+        # Verify and decode ID token
+        idinfo = google_jwt.decode(
+            id_token_str,
+            certs=await self._get_certs(),
+            audience=self.client_id,
+        )
+        
+        if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
+            raise ValueError('Invalid token issuer')
+        
+        return {
+            "id": idinfo.get('sub'),
+            "email": idinfo.get('email'),
+            "first_name": idinfo.get('given_name'),
+            "last_name": idinfo.get('family_name'),
+            "email_verified": idinfo.get('email_verified', False)
+        }
+
     def get_provider_name(self) -> str:
         """Get provider name."""
         return "google"
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Shared HTTP client for calls to OAuth providers."""
+
+from typing import Optional
+
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide client, keeping provider connections alive between logins."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client; a later call to get_http_client opens a new one."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
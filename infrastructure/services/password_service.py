@@ -1,13 +1,23 @@
 """Password service for hashing and verification."""
 
+import asyncio
+
 from passlib.context import CryptContext
 
+from config.settings import settings
+
 
 class PasswordService:
     """Service for password hashing and verification."""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        # bcrypt_sha256 pre-hashes with SHA-256, so passwords longer than bcrypt's
+        # 72-byte limit are not truncated; plain bcrypt hashes still verify
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt_sha256", "bcrypt"],
+            deprecated="auto",
+            bcrypt_sha256__rounds=settings.BCRYPT_ROUNDS,
+        )
     
     def hash_password(self, password: str) -> str:
         """Hash a password."""
@@ -15,4 +25,20 @@ class PasswordService:
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return self.pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+        return self.pwd_context.verify(plain_password, hashed_password)
+    
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a password in a worker thread, keeping bcrypt off the event loop."""
+        return await asyncio.to_thread(self.pwd_context.hash, password)
+    
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in a worker thread, keeping bcrypt off the event loop."""
+        return await asyncio.to_thread(self.pwd_context.verify, plain_password, hashed_password)
+    
+    async def dummy_verify_async(self) -> None:
+        """Take as long as verifying a password, for callers with no hash to check."""
+        await asyncio.to_thread(self.pwd_context.dummy_verify)
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check if a hash uses a deprecated scheme and should be replaced."""
+        return self.pwd_context.needs_update(hashed_password)
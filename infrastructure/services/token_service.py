@@ -1,12 +1,16 @@
 """Token service for JWT operations."""
 
+import base64
+import hashlib
+import hmac
+import json
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional
-from jose import JWTError, jwt
+from typing import Dict, Any, Optional, Tuple
+from jose import JWTError, jwk, jwt
 from uuid import UUID
 
 from config.settings import settings
-from infrastructure.database.repositories.password_reset_repository import PasswordResetRepository
 
 import logging
 
@@ -16,60 +20,117 @@ logger = logging.getLogger(__name__)
 class TokenService:
     """Service for JWT token operations."""
 
-    def __init__(self, password_reset_repo: PasswordResetRepository):
-        self.password_reset_repo = password_reset_repo
+    __slots__ = (
+        "secret_key",
+        "algorithm",
+        "access_token_expire_minutes",
+        "refresh_token_expire_days",
+        "email_verification_expire_hours",
+        "password_reset_expire_minutes",
+        "_access_token_expiry_seconds",
+        "_signing_key",
+        "_jwt_key",
+    )
+
+    def __init__(self):
         self.secret_key = settings.SECRET_KEY
         self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
         self.email_verification_expire_hours = settings.EMAIL_VERIFICATION_EXPIRE_HOURS
         self.password_reset_expire_minutes = 60
+        self._access_token_expiry_seconds = self.access_token_expire_minutes * 60
+        self._signing_key = hashlib.blake2b(self.secret_key.encode(), digest_size=32).digest()
+        # A prepared key skips jose's per-call key construction and the JSON
+        # parse it attempts on a plain string key during verification
+        self._jwt_key = jwk.construct(self.secret_key, self.algorithm)
 
     def create_access_token(self, data: Dict[str, Any]) -> str:
         """Create JWT access token."""
-        to_encode = data.copy()
         expire = datetime.now(timezone.utc) + timedelta(minutes=self.access_token_expire_minutes)
-        to_encode.update({"exp": expire, "type": "access"})
+        to_encode = {**data, "exp": expire, "type": "access"}
 
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(to_encode, self._jwt_key, algorithm=self.algorithm)
 
-    def create_refresh_token(self, user_id: str) -> str:
-        """Create JWT refresh token."""
+    def create_refresh_token(self, user_id: str, token_version: int = 0) -> str:
+        """Create JWT refresh token bound to the user's current token version."""
         to_encode = {
             "sub": user_id,
             "exp": datetime.now(timezone.utc) + timedelta(days=self.refresh_token_expire_days),
             "type": "refresh",
+            "ver": token_version,
         }
 
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(to_encode, self._jwt_key, algorithm=self.algorithm)
 
-    def create_password_reset_token(self, user_id: UUID, expire_minutes: int = 60) -> str:
-        """Create JWT password reset token."""
-        expires_at = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
-        token = jwt.encode(
-            {"sub": str(user_id), "exp": expires_at, "type": "password_reset"},
-            self.secret_key,
+    def create_token_pair(self, user_id: str, token_version: int = 0) -> Tuple[str, str]:
+        """Create the access and refresh tokens issued at sign-in from one timestamp."""
+        now = datetime.now(timezone.utc)
+        access_token = jwt.encode(
+            {"sub": user_id, "exp": now + timedelta(minutes=self.access_token_expire_minutes), "type": "access"},
+            self._jwt_key,
             algorithm=self.algorithm,
         )
-
-        self.password_reset_repo.create(
-            {"user_id": user_id, "token": token, "expires_at": expires_at, "is_used": False}
+        refresh_token = jwt.encode(
+            {
+                "sub": user_id,
+                "exp": now + timedelta(days=self.refresh_token_expire_days),
+                "type": "refresh",
+                "ver": token_version,
+            },
+            self._jwt_key,
+            algorithm=self.algorithm,
+        )
+        return access_token, refresh_token
+
+    def create_password_reset_token(
+        self, user_id: UUID, expire_minutes: int = 60, expires_at: Optional[datetime] = None
+    ) -> str:
+        """Create JWT password reset token, expiring at ``expires_at`` when given."""
+        if expires_at is None:
+            expires_at = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
+        return jwt.encode(
+            {"sub": str(user_id), "exp": expires_at, "type": "password_reset"},
+            self._jwt_key,
+            algorithm=self.algorithm,
         )
-        return token
 
     def create_2fa_token(self, user_id: str) -> str:
-        """Create a short-lived token for 2FA verification."""
-        to_encode = {
-            "sub": user_id,
-            "exp": datetime.now(timezone.utc) + timedelta(minutes=10),  # 2FA token valid for 10 minutes
-            "type": "2fa",
-        }
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        """Create a short-lived token for 2FA verification.
+
+        This is an internal compact format (payload.signature, keyed BLAKE2b),
+        not an interoperable JWT - it is only ever checked by verify_2fa_token.
+        """
+        payload = json.dumps(
+            {"sub": user_id, "exp": int(time.time()) + 600},  # 2FA token valid for 10 minutes
+            separators=(",", ":"),
+        ).encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._sign_2fa(payload))}"
+
+    def verify_2fa_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify a 2FA token and return its payload."""
+        try:
+            encoded_payload, encoded_sig = token.split(".")
+            payload = _b64decode(encoded_payload)
+            if not hmac.compare_digest(self._sign_2fa(payload), _b64decode(encoded_sig)):
+                return None
+            data = json.loads(payload)
+        except ValueError:
+            return None
+
+        if data.get("exp", 0) < time.time():
+            return None
+        return data
+
+    def _sign_2fa(self, payload: bytes) -> bytes:
+        return hashlib.blake2b(
+            payload, key=self._signing_key, digest_size=16, person=b"2fa-token"
+        ).digest()
 
     def verify_token(self, token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
         """Verify and decode JWT token with type check."""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = jwt.decode(token, self._jwt_key, algorithms=[self.algorithm])
 
             if payload.get("type") != token_type:
                 return None
@@ -80,23 +141,11 @@ class TokenService:
             return None
 
     def verify_password_reset_token(self, token: str) -> Optional[str]:
-        """Verify password reset token and return user_id if valid."""
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-
-            if payload.get("type") != "password_reset":
-                return None
-
-            db_token = self.password_reset_repo.get_by_token(token)
-            if not db_token or db_token.is_used or db_token.expires_at < datetime.now(timezone.utc):
-                return None
-
-            self.password_reset_repo.mark_used(db_token.id)
-            return payload.get("sub")  # user_id
-        except jwt.ExpiredSignatureError:
-            return None
-        except jwt.InvalidTokenError:
+        """Verify password reset token signature and return user_id if valid."""
+        payload = self.verify_token(token, token_type="password_reset")
+        if not payload:
             return None
+        return payload.get("sub")  # user_id
 
     def generate_verification_token(self, user_id: str) -> str:
         """Generate a secure JWT for email verification."""
@@ -105,7 +154,7 @@ class TokenService:
             "exp": datetime.now(timezone.utc) + timedelta(hours=self.email_verification_expire_hours),
             "type": "email_verification",
         }
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return jwt.encode(to_encode, self._jwt_key, algorithm=self.algorithm)
 
     def verify_verification_token(self, token: str) -> Optional[str]:
         """Verify the email verification token and return the user ID."""
@@ -116,4 +165,12 @@ class TokenService:
 
     def get_access_token_expiry(self) -> int:
         """Get access token expiry in seconds."""
-        return self.access_token_expire_minutes * 60
+        return self._access_token_expiry_seconds
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
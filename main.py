@@ -1,12 +1,17 @@
 """Main FastAPI application with Clean Architecture."""
 
-from fastapi import FastAPI
+import asyncio
+import json
+from contextlib import suppress
+
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from contextlib import asynccontextmanager
 
-from config.database import init_db
+from config.database import SessionLocal, init_db
 from config.settings import settings
 from config.logging_config import setup_logging
 from config.exceptions import (
@@ -16,20 +21,35 @@ from config.exceptions import (
     database_exception_handler,
     general_exception_handler,
 )
+from infrastructure.database.cleanup import run_daily_token_cleanup
+from infrastructure.external_services.http_client import close_http_client
 from presentation.api.controllers import auth_router
+from presentation.rate_limit import create_rate_limiter
 
 # Setup logging
 logger = setup_logging()
 
+_HEALTH_BODY = json.dumps(
+    {"status": "healthy", "service": "Syria GPT Clean Architecture API", "version": "2.0.0"}
+).encode()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management."""
     # Startup
     logger.info("Starting Syria GPT API...")
+    # Expired tokens are purged off-peak rather than from request handlers
+    cleanup_task = asyncio.create_task(
+        run_daily_token_cleanup(SessionLocal, settings.TOKEN_CLEANUP_HOUR)
+    )
     yield
     # Shutdown
     logger.info("Shutting down Syria GPT API...")
+    cleanup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await cleanup_task
+    await close_http_client()
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -38,6 +58,7 @@ def create_app() -> FastAPI:
         description="Clean Architecture Authentication API with OAuth 2.0 integration",
         version="2.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs" if settings.DEBUG else None,
         redoc_url="/redoc" if settings.DEBUG else None,
     )
@@ -58,22 +79,27 @@ def create_app() -> FastAPI:
     app.add_exception_handler(Exception, general_exception_handler)
 
     # Include routers
+    app.state.rate_limiter = create_rate_limiter()
     app.include_router(auth_router)
 
-    # Health endpoints
-    @app.get("/")
-    def read_root():
-        """Root endpoint."""
-        return {
+    # Health endpoints - bodies are static, so serialize them once up front
+    root_body = json.dumps(
+        {
             "message": "Welcome to Syria GPT Clean Architecture API!",
             "version": "2.0.0",
             "docs": "/docs" if settings.DEBUG else "Contact admin for API documentation",
         }
+    ).encode()
+
+    @app.get("/", response_class=Response)
+    async def read_root():
+        """Root endpoint."""
+        return Response(content=root_body, media_type="application/json")
 
-    @app.get("/health")
-    def health_check():
+    @app.get("/health", response_class=Response)
+    async def health_check():
         """Health check endpoint."""
-        return {"status": "healthy", "service": "Syria GPT Clean Architecture API", "version": "2.0.0"}
+        return Response(content=_HEALTH_BODY, media_type="application/json")
 
     return app
 
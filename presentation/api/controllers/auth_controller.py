@@ -1,12 +1,11 @@
 """Authentication controller - handles HTTP requests."""
 
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
-from uuid import UUID
-from presentation.schemas import TwoFactorVerificationRequest
+from fastapi import APIRouter, HTTPException, Request, status, Depends
+from fastapi.responses import ORJSONResponse
 
 from application import AuthApplicationService
-from presentation.schemas.auth_schemas import (
+from presentation.schemas import (
     UserSignUpRequest,
     UserSignInRequest,
     UserResponse,
@@ -18,13 +17,19 @@ from presentation.schemas.auth_schemas import (
     EmailVerificationRequest,
     PasswordResetRequest,
     PasswordResetConfirmRequest,
+    TwoFactorVerificationRequest,
 )
 
-from presentation.dependencies import get_auth_service, get_current_user
+from presentation.dependencies import get_auth_service, get_current_user, get_oauth_url_service
+from presentation.rate_limit import enforce_rate_limit
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Use-case results are plain dicts that already match the response schemas, so
+# they are returned as ORJSONResponse to skip FastAPI's outbound validation;
+# response_model is kept on the routes for the OpenAPI schema.
+
 
 @router.post("/signup", response_model=MessageResponse)
 async def sign_up(
@@ -32,20 +37,24 @@ async def sign_up(
 ):
     """Register a new user."""
     try:
-        result = await auth_service.register_user(user_data.model_dump())
-        return MessageResponse(**result)
+        result = await auth_service.register_user(user_data.model_dump(exclude_unset=True))
+        return ORJSONResponse({"message": result["message"]})
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/signin", response_model=TokenResponse)
 async def sign_in(
-    credentials: UserSignInRequest, auth_service: AuthApplicationService = Depends(get_auth_service)
+    request: Request,
+    credentials: UserSignInRequest,
+    auth_service: AuthApplicationService = Depends(get_auth_service),
 ):
     """Authenticate user and return tokens."""
+    # Checked before the password hash is verified, so rejected attempts stay cheap
+    enforce_rate_limit(request, "signin", credentials.email.lower())
     try:
         tokens = await auth_service.authenticate_user(credentials.email, credentials.password)
-        return TokenResponse(**tokens)
+        return ORJSONResponse(tokens)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
@@ -61,51 +70,55 @@ async def verify_2fa(
         tokens = await auth_service.verify_2fa_code(
             verification_data.tfa_token, verification_data.code
         )
-        return TokenResponse(**tokens)
+        return ORJSONResponse(tokens)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 
 @router.get("/google")
-async def google_auth(auth_service: AuthApplicationService = Depends(get_auth_service)):
+async def google_auth(auth_service: AuthApplicationService = Depends(get_oauth_url_service)):
     """Get Google OAuth URL."""
     try:
-        return auth_service.get_google_auth_url()
+        return ORJSONResponse(auth_service.get_google_auth_url())
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
 
 
 @router.post("/google/callback", response_model=TokenResponse)
 async def google_callback(
+    request: Request,
     auth_request: GoogleAuthRequest,
     auth_service: AuthApplicationService = Depends(get_auth_service),
 ):
     """Handle Google OAuth callback."""
+    enforce_rate_limit(request, "google_callback")
     try:
         tokens = await auth_service.authenticate_with_google(auth_request.code)
-        return TokenResponse(**tokens)
+        return ORJSONResponse(tokens)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/facebook")
-async def facebook_auth(auth_service: AuthApplicationService = Depends(get_auth_service)):
+async def facebook_auth(auth_service: AuthApplicationService = Depends(get_oauth_url_service)):
     """Get Facebook OAuth URL."""
     try:
-        return auth_service.get_facebook_auth_url()
+        return ORJSONResponse(auth_service.get_facebook_auth_url())
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
 
 
 @router.post("/facebook/callback", response_model=TokenResponse)
 async def facebook_callback(
+    request: Request,
     auth_request: FacebookAuthRequest,
     auth_service: AuthApplicationService = Depends(get_auth_service),
 ):
     """Handle Facebook OAuth callback."""
+    enforce_rate_limit(request, "facebook_callback")
     try:
         tokens = await auth_service.authenticate_with_facebook(auth_request.code)
-        return TokenResponse(**tokens)
+        return ORJSONResponse(tokens)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -118,7 +131,7 @@ async def verify_email(
     """Verify user email with token."""
     try:
         result = await auth_service.verify_email(verification_request.token)
-        return MessageResponse(**result)
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -132,9 +145,9 @@ async def change_password(
     """Change user password."""
     try:
         result = await auth_service.change_password(
-            UUID(current_user["sub"]), password_data.current_password, password_data.new_password
+            current_user["sub_uuid"], password_data.current_password, password_data.new_password
         )
-        return MessageResponse(**result)
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -142,34 +155,35 @@ async def change_password(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Get current user information."""
-    user_id = current_user.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
-        )
-
-    return UserResponse(
-        id=user_id,
-        email=current_user.get("email", ""),
-        first_name=current_user.get("first_name", ""),
-        last_name=current_user.get("last_name", ""),
-        is_email_verified=current_user.get("is_email_verified", False),
-        is_phone_verified=current_user.get("is_phone_verified", False),
-        two_factor_enabled=current_user.get("two_factor_enabled", False),
-        status=current_user.get("status", "active"),
-        is_active=current_user.get("is_active", True),
-    )
+    # get_current_user has already parsed the subject, and orjson encodes UUIDs
+    # natively, so the id is never round-tripped through a string
+    return ORJSONResponse({
+        "id": current_user["sub_uuid"],
+        "email": current_user.get("email", ""),
+        "first_name": current_user.get("first_name", ""),
+        "last_name": current_user.get("last_name", ""),
+        "phone_number": current_user.get("phone_number"),
+        "is_email_verified": current_user.get("is_email_verified", False),
+        "is_phone_verified": current_user.get("is_phone_verified", False),
+        "two_factor_enabled": current_user.get("two_factor_enabled", False),
+        "status": current_user.get("status", "active"),
+        "is_active": current_user.get("is_active", True),
+        "created_at": None,
+        "updated_at": None,
+    })
 
 
 @router.post("/request-password-reset", response_model=MessageResponse)
 async def request_password_reset(
+    request: Request,
     reset_request: PasswordResetRequest,
     auth_service: AuthApplicationService = Depends(get_auth_service),
 ):
     """Request password reset link via email."""
+    enforce_rate_limit(request, "password_reset", reset_request.email.lower())
     try:
         result = await auth_service.request_password_reset(reset_request.email)
-        return MessageResponse(**result)
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -184,6 +198,6 @@ async def confirm_password_reset(
         result = await auth_service.confirm_password_reset(
             confirm_request.token, confirm_request.new_password
         )
-        return MessageResponse(**result)
+        return ORJSONResponse(result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
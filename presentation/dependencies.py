@@ -1,7 +1,11 @@
 """Dependency injection for presentation layer."""
 
-from typing import Dict, Any
-from fastapi import Depends, HTTPException, status
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+from uuid import UUID
+from fastapi import BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -17,66 +21,70 @@ from config.database import get_db
 # Security
 security = HTTPBearer()
 
-# Singleton services
-_password_service = None
-_token_service = None
-_email_service = None
-_google_provider = None
-_facebook_provider = None
+# Verified access token payloads keyed by raw token: token -> (payload, expires_at)
+_ACCESS_TOKEN_CACHE_SIZE = 10_000
+_ACCESS_TOKEN_CACHE_TTL = 60
+_access_token_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_access_token_cache_lock = threading.Lock()
 
 
+@lru_cache(maxsize=None)
 def get_password_service() -> PasswordService:
     """Get singleton password service."""
-    global _password_service
-    if _password_service is None:
-        _password_service = PasswordService()
-    return _password_service
+    return PasswordService()
 
 
-def get_token_service(db: Session = Depends(get_db)) -> TokenService:
+@lru_cache(maxsize=None)
+def get_token_service() -> TokenService:
     """Get singleton token service."""
-    global _token_service
-    if _token_service is None:
-        password_reset_repo = PasswordResetRepository(db)
-        _token_service = TokenService(password_reset_repo)
-    return _token_service
+    return TokenService()
 
 
+@lru_cache(maxsize=None)
 def get_email_service() -> EmailService:
     """Get singleton email service."""
-    global _email_service
-    if _email_service is None:
-        _email_service = EmailService()
-    return _email_service
+    return EmailService()
 
 
+@lru_cache(maxsize=None)
 def get_google_provider() -> GoogleOAuthProvider:
     """Get singleton Google OAuth provider."""
-    global _google_provider
-    if _google_provider is None:
-        _google_provider = GoogleOAuthProvider()
-    return _google_provider
+    return GoogleOAuthProvider()
 
 
+@lru_cache(maxsize=None)
 def get_facebook_provider() -> FacebookOAuthProvider:
     """Get singleton Facebook OAuth provider."""
-    global _facebook_provider
-    if _facebook_provider is None:
-        _facebook_provider = FacebookOAuthProvider()
-    return _facebook_provider
+    return FacebookOAuthProvider()
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthApplicationService:
+@lru_cache(maxsize=None)
+def get_oauth_url_service() -> AuthApplicationService:
+    """Get singleton service for OAuth URL routes, which need no DB session."""
+    return AuthApplicationService(
+        auth_use_cases=None,
+        google_provider=get_google_provider(),
+        facebook_provider=get_facebook_provider(),
+    )
+
+
+def get_auth_service(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> AuthApplicationService:
     """Get authentication application service."""
     user_repository = UserRepositoryImpl(db)
     two_factor_auth_repository = TwoFactorAuthRepositoryImpl(db)
-    token_service = get_token_service(db)
+    password_reset_repository = PasswordResetRepository(db)
     auth_use_cases = AuthUseCases(
         user_repository=user_repository,
         password_service=get_password_service(),
-        token_service=token_service,
+        token_service=get_token_service(),
         email_service=get_email_service(),
         two_factor_auth_repository=two_factor_auth_repository,
+        password_reset_repository=password_reset_repository,
+        # Emails go out after the response, once the request's transaction has committed
+        email_dispatcher=background_tasks.add_task,
     )
     return AuthApplicationService(
         auth_use_cases=auth_use_cases,
@@ -86,13 +94,12 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthApplicationService:
 
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> Dict[str, Any]:
-    """Get current user from JWT token."""
+    """Get current user from JWT token, with the subject parsed as `sub_uuid`."""
     token = credentials.credentials
-    token_service = get_token_service(db)
 
-    payload = token_service.verify_token(token, "access")
+    payload = _verify_access_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -101,3 +108,32 @@ def get_current_user(
         )
 
     return payload
+
+
+def _verify_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify an access token, reusing recent verifications of the same token."""
+    now = time.time()
+    with _access_token_cache_lock:
+        cached = _access_token_cache.get(token)
+    if cached is not None:
+        payload, expires_at = cached
+        if now < expires_at:
+            return payload
+        with _access_token_cache_lock:
+            _access_token_cache.pop(token, None)
+
+    payload = get_token_service().verify_token(token, "access")
+    if not payload:
+        return None
+    try:
+        payload["sub_uuid"] = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    # Never serve a payload past the token's own expiry
+    expires_at = min(now + _ACCESS_TOKEN_CACHE_TTL, payload["exp"])
+    with _access_token_cache_lock:
+        if len(_access_token_cache) >= _ACCESS_TOKEN_CACHE_SIZE:
+            _access_token_cache.pop(next(iter(_access_token_cache)))
+        _access_token_cache[token] = (payload, expires_at)
+    return payload
@@ -0,0 +1,61 @@
+"""In-process token bucket rate limiting for expensive auth routes."""
+
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from config.settings import settings
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by caller; each holds up to `capacity` requests."""
+
+    def __init__(self, capacity: int, refill_per_second: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Take one token from the key's bucket, returning False if it is empty."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.pop(next(iter(self._buckets)))
+            # Re-inserting keeps the dict ordered by last use for eviction
+            self._buckets[key] = (tokens, now)
+        return allowed
+
+
+def create_rate_limiter() -> TokenBucketLimiter:
+    """Create the limiter shared by an application's rate-limited routes."""
+    return TokenBucketLimiter(
+        capacity=settings.RATE_LIMIT_BURST,
+        refill_per_second=settings.RATE_LIMIT_PER_MINUTE / 60,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_default_rate_limiter() -> TokenBucketLimiter:
+    """Get the process-wide limiter for apps that do not register their own."""
+    return create_rate_limiter()
+
+
+def enforce_rate_limit(request: Request, scope: str, subject: str = "") -> None:
+    """Reject the request with 429 once the client has used up its bucket for `scope`."""
+    limiter = getattr(request.app.state, "rate_limiter", None) or get_default_rate_limiter()
+    client_host = request.client.host if request.client else "unknown"
+    if not limiter.allow(f"{scope}:{client_host}:{subject}"):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please try again later",
+        )
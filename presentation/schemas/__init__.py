@@ -4,11 +4,13 @@ from .auth_schemas import (
     UserSignUpRequest, UserSignInRequest, UserResponse, TokenResponse,
     GoogleAuthRequest, FacebookAuthRequest, MessageResponse,
     ChangePasswordRequest, EmailVerificationRequest,
+    PasswordResetRequest, PasswordResetConfirmRequest,
     TwoFactorVerificationRequest  # تمت الإضافة هنا
 )
 
 __all__ = [
     "UserSignUpRequest", "UserSignInRequest", "UserResponse", "TokenResponse",
     "GoogleAuthRequest", "FacebookAuthRequest", "EmailVerificationRequest",
-    "ChangePasswordRequest", "MessageResponse", "TwoFactorVerificationRequest"
+    "ChangePasswordRequest", "MessageResponse", "PasswordResetRequest",
+    "PasswordResetConfirmRequest", "TwoFactorVerificationRequest"
 ]
\ No newline at end of file
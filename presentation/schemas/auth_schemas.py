@@ -1,10 +1,14 @@
 """Request/Response schemas for authentication."""
 
-from pydantic import BaseModel, EmailStr, Field, validator, field_validator
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
+# Issued tokens are well under this; longer input is rejected before any
+# signature check or database lookup
+TOKEN_MAX_LENGTH = 2048
+
 
 class UserSignUpRequest(BaseModel):
     """User signup request schema."""
@@ -57,20 +61,13 @@ class FacebookAuthRequest(BaseModel):
 
 class EmailVerificationRequest(BaseModel):
     """Email verification request schema."""
-    token: str
+    token: str = Field(..., max_length=TOKEN_MAX_LENGTH)
 
 
 class ChangePasswordRequest(BaseModel):
     """Change password request schema."""
     current_password: str
-    new_password: str
-    
-    @field_validator('new_password')
-    @classmethod
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    new_password: str = Field(..., min_length=8, description="Password must be at least 8 characters")
 
 class PasswordResetRequest(BaseModel):
     """Password reset request schema."""
@@ -78,15 +75,8 @@ class PasswordResetRequest(BaseModel):
 
 class PasswordResetConfirmRequest(BaseModel):
     """Password reset confirm request schema."""
-    token: str
-    new_password: str
-
-    @field_validator('new_password')
-    @classmethod
-    def validate_new_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    token: str = Field(..., max_length=TOKEN_MAX_LENGTH)
+    new_password: str = Field(..., min_length=8, description="Password must be at least 8 characters")
 
 
 class MessageResponse(BaseModel):
@@ -97,5 +87,7 @@ class MessageResponse(BaseModel):
 
 # أضف هذا الكلاس في نهاية الملف
 class TwoFactorVerificationRequest(BaseModel):
-    tfa_token: str = Field(..., description="The temporary token received during sign-in")
-    code: str = Field(..., min_length=6, max_length=6, description="The 6-digit code sent to the user's email")
\ No newline at end of file
+    tfa_token: str = Field(
+        ..., max_length=TOKEN_MAX_LENGTH, description="The temporary token received during sign-in"
+    )
+    code: str = Field(..., pattern=r"^\d{6}$", description="The 6-digit code sent to the user's email")
\ No newline at end of file
@@ -134,7 +134,7 @@ exit /b 1
 
 REM Run database migrations
 echo Running database migrations...
-docker exec syria-gpt-app alembic upgrade head
+docker exec syria-gpt-app python scripts/migrate.py upgrade
 if %errorlevel% neq 0 (
     echo ERROR: Database migration failed.
     exit /b 1
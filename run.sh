@@ -26,7 +26,7 @@ fi
 
 # Run database migrations
 echo "Running database migrations..."
-docker exec syria-gpt-app alembic upgrade head
+docker exec syria-gpt-app python scripts/migrate.py upgrade
 
 echo ""
 echo "The Syria-Gpt application is now running."
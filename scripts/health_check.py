@@ -5,174 +5,275 @@ Comprehensive health check script for Syria GPT application.
 This script validates all components of the application are working correctly.
 """
 
+import io
+import os
+import re
 import sys
-import requests
+import threading
+import httpx
 import json
+import orjson
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import subprocess
 import time
 
-def print_status(message, status="INFO"):
+API_BASE_URL = "http://localhost:9000"
+
+# One pooled client for every API probe, so the checks reuse keep-alive
+# connections instead of opening a new one per request
+_session = httpx.Client(base_url=API_BASE_URL, timeout=5)
+
+# Successful GET probes are cached on disk for HEALTH_CACHE_TTL seconds, so
+# back-to-back runs from an external monitor skip redundant requests. Failures
+# are never cached, so recovery shows up on the next run
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "10"))
+HEALTH_CACHE_PATH = Path(__file__).resolve().parent.parent / ".health_cache.json"
+_cache = None
+_cache_lock = threading.Lock()
+
+# Container checks talk to the Docker Engine API over its unix socket rather
+# than spawning a docker-compose process per check
+APP_CONTAINER = "syria-gpt-app"
+CONTAINER_PREFIX = "syria-gpt-"
+DOCKER_SOCKET = os.getenv("DOCKER_HOST", "unix:///var/run/docker.sock").removeprefix("unix://")
+_docker = httpx.Client(
+    base_url="http://docker",
+    transport=httpx.HTTPTransport(uds=DOCKER_SOCKET),
+    timeout=10,
+)
+
+def _load_cache():
+    """Load unexpired cache entries, ignoring a missing or corrupt file."""
+    try:
+        cache = json.loads(HEALTH_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    now = time.time()
+    return {path: entry for path, entry in cache.items() if entry.get("expires_at", 0) > now}
+
+def _save_cache():
+    """Persist the cache; failures only cost a fresh request next run."""
+    if _cache is None:
+        return
+    try:
+        HEALTH_CACHE_PATH.write_text(json.dumps(_cache), encoding="utf-8")
+    except OSError:
+        pass
+
+def _cached_get(path):
+    """GET an API path, returning its status code and JSON body (or None)."""
+    global _cache
+    if HEALTH_CACHE_TTL > 0:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _load_cache()
+            entry = _cache.get(path)
+        if entry and entry["expires_at"] > time.time():
+            return entry["status_code"], entry["data"]
+    
+    response = _session.get(path)
+    is_json = response.headers.get("content-type", "").startswith("application/json")
+    data = response.json() if is_json else None
+    
+    if HEALTH_CACHE_TTL > 0 and response.is_success:
+        with _cache_lock:
+            _cache[path] = {
+                "status_code": response.status_code,
+                "data": data,
+                "expires_at": time.time() + HEALTH_CACHE_TTL,
+            }
+    return response.status_code, data
+
+LOG_PROBLEM_PATTERN = re.compile(rb"(?i)(error|exception|traceback)")
+
+def _demux_docker_stream(data):
+    """Strip the frame headers from a multiplexed Docker stdout/stderr stream."""
+    chunks = []
+    while len(data) >= 8:
+        size = int.from_bytes(data[4:8], "big")
+        chunks.append(data[8:8 + size])
+        data = data[8 + size:]
+    return b"".join(chunks)
+
+def _docker_exec(container, cmd):
+    """Run a command in a container, returning its exit code and output."""
+    response = _docker.post(
+        f"/containers/{container}/exec",
+        json={"Cmd": cmd, "AttachStdout": True, "AttachStderr": True},
+    )
+    response.raise_for_status()
+    exec_id = response.json()["Id"]
+    
+    response = _docker.post(f"/exec/{exec_id}/start", json={"Detach": False, "Tty": False})
+    response.raise_for_status()
+    output = _demux_docker_stream(response.content).decode(errors="replace")
+    
+    exit_code = _docker.get(f"/exec/{exec_id}/json").json().get("ExitCode")
+    return exit_code, output
+
+def print_status(message, status="INFO", out=None):
     """Print formatted status message."""
     symbols = {"INFO": "i", "SUCCESS": "[OK]", "ERROR": "[X]", "WARNING": "!"}
     symbol = symbols.get(status, "•")
-    print(f"[{symbol}] {message}")
+    print(f"[{symbol}] {message}", file=out)
 
-def check_api_health():
+def check_api_health(out=None):
     """Check API health endpoints."""
     try:
         # Health check
-        response = requests.get("http://localhost:9000/health", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            print_status(f"API Health: {data['status']} - {data['service']} v{data['version']}", "SUCCESS")
+        status_code, data = _cached_get("/health")
+        if status_code == 200:
+            print_status(f"API Health: {data['status']} - {data['service']} v{data['version']}", "SUCCESS", out=out)
         else:
-            print_status(f"API Health check failed: HTTP {response.status_code}", "ERROR")
+            print_status(f"API Health check failed: HTTP {status_code}", "ERROR", out=out)
             return False
             
         # Root endpoint
-        response = requests.get("http://localhost:9000/", timeout=5)
-        if response.status_code == 200:
-            print_status("Root endpoint accessible", "SUCCESS")
+        status_code, _ = _cached_get("/")
+        if status_code == 200:
+            print_status("Root endpoint accessible", "SUCCESS", out=out)
         else:
-            print_status(f"Root endpoint failed: HTTP {response.status_code}", "WARNING")
+            print_status(f"Root endpoint failed: HTTP {status_code}", "WARNING", out=out)
             
         # Documentation
-        response = requests.get("http://localhost:9000/docs", timeout=5)
-        if response.status_code == 200:
-            print_status("API documentation accessible", "SUCCESS")
+        status_code, _ = _cached_get("/docs")
+        if status_code == 200:
+            print_status("API documentation accessible", "SUCCESS", out=out)
         else:
-            print_status("API documentation not accessible", "WARNING")
+            print_status("API documentation not accessible", "WARNING", out=out)
             
         return True
         
-    except requests.RequestException as e:
-        print_status(f"API connection failed: {e}", "ERROR")
+    except httpx.HTTPError as e:
+        print_status(f"API connection failed: {e}", "ERROR", out=out)
         return False
 
-def check_auth_endpoints():
+def check_auth_endpoints(out=None):
     """Check authentication endpoints."""
     try:
         # Google OAuth
-        response = requests.get("http://localhost:9000/auth/google", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if "auth_url" in data and "provider" in data:
-                print_status("Google OAuth endpoint working", "SUCCESS")
+        status_code, data = _cached_get("/auth/google")
+        if status_code == 200:
+            if data and "auth_url" in data and "provider" in data:
+                print_status("Google OAuth endpoint working", "SUCCESS", out=out)
             else:
-                print_status("Google OAuth endpoint response invalid", "WARNING")
+                print_status("Google OAuth endpoint response invalid", "WARNING", out=out)
         else:
-            print_status(f"Google OAuth failed: HTTP {response.status_code}", "ERROR")
+            print_status(f"Google OAuth failed: HTTP {status_code}", "ERROR", out=out)
             
         # Registration test (expect validation error for incomplete data)
-        response = requests.post("http://localhost:9000/auth/signup", 
-                               json={"email": "invalid"}, timeout=5)
+        response = _session.post("/auth/signup", json={"email": "invalid"})
         if response.status_code in [400, 422]:  # Validation error expected
-            print_status("Registration endpoint responding to validation", "SUCCESS")
+            print_status("Registration endpoint responding to validation", "SUCCESS", out=out)
         else:
-            print_status(f"Registration endpoint unexpected response: HTTP {response.status_code}", "WARNING")
+            print_status(f"Registration endpoint unexpected response: HTTP {response.status_code}", "WARNING", out=out)
             
         return True
         
-    except requests.RequestException as e:
-        print_status(f"Auth endpoints check failed: {e}", "ERROR")
+    except httpx.HTTPError as e:
+        print_status(f"Auth endpoints check failed: {e}", "ERROR", out=out)
         return False
 
-def check_containers():
+def check_containers(out=None):
     """Check Docker container status."""
     try:
-        result = subprocess.run(
-            ["docker-compose", "ps", "--format", "json"], 
-            capture_output=True, text=True, cwd=Path(__file__).parent
+        response = _docker.get(
+            "/containers/json",
+            params={"all": "true", "filters": json.dumps({"name": [CONTAINER_PREFIX]})},
         )
         
-        if result.returncode == 0:
-            containers = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    try:
-                        container = json.loads(line)
-                        containers.append(container)
-                    except json.JSONDecodeError:
-                        continue
+        if response.status_code == 200:
+            containers = orjson.loads(response.content)
                         
             for container in containers:
-                name = container.get('Service', 'Unknown')
+                name = container.get('Labels', {}).get('com.docker.compose.service', 'Unknown')
                 state = container.get('State', 'Unknown')
                 status = container.get('Status', 'Unknown')
                 
                 if state == 'running':
-                    print_status(f"Container {name}: {state} ({status})", "SUCCESS")
+                    print_status(f"Container {name}: {state} ({status})", "SUCCESS", out=out)
                 else:
-                    print_status(f"Container {name}: {state} ({status})", "ERROR")
+                    print_status(f"Container {name}: {state} ({status})", "ERROR", out=out)
                     
             return len([c for c in containers if c.get('State') == 'running']) >= 2
         else:
-            print_status("Failed to check container status", "ERROR")
+            print_status("Failed to check container status", "ERROR", out=out)
             return False
             
     except Exception as e:
-        print_status(f"Container check failed: {e}", "ERROR")
+        print_status(f"Container check failed: {e}", "ERROR", out=out)
         return False
 
-def check_database():
+def check_database(out=None):
     """Check database connectivity."""
     try:
         # Test database connection through migration utility
-        result = subprocess.run(
-            ["docker-compose", "exec", "-T", "app", "python", "migrate.py", "status"],
-            capture_output=True, text=True, cwd=Path(__file__).parent, timeout=10
-        )
+        exit_code, output = _docker_exec(APP_CONTAINER, ["python", "scripts/migrate.py", "status"])
         
-        if result.returncode == 0:
-            output = result.stdout
+        if exit_code == 0:
             if "[SUCCESS]" in output:
-                print_status("Database connection and migrations: UP TO DATE", "SUCCESS")
+                print_status("Database connection and migrations: UP TO DATE", "SUCCESS", out=out)
                 return True
             elif "[WARNING]" in output:
-                print_status("Database connection: OK, migrations may be needed", "WARNING")
+                print_status("Database connection: OK, migrations may be needed", "WARNING", out=out)
                 return True
         
-        print_status("Database connection or migrations failed", "ERROR")
+        print_status("Database connection or migrations failed", "ERROR", out=out)
         return False
         
-    except subprocess.TimeoutExpired:
-        print_status("Database check timed out", "ERROR")
+    except httpx.TimeoutException:
+        print_status("Database check timed out", "ERROR", out=out)
         return False
     except Exception as e:
-        print_status(f"Database check failed: {e}", "ERROR")
+        print_status(f"Database check failed: {e}", "ERROR", out=out)
         return False
 
-def check_logs():
+def check_logs(out=None):
     """Check for recent errors in logs."""
     try:
-        result = subprocess.run(
-            ["docker-compose", "logs", "--tail", "20", "app"],
-            capture_output=True, text=True, cwd=Path(__file__).parent
+        response = _docker.get(
+            f"/containers/{APP_CONTAINER}/logs",
+            params={"stdout": "true", "stderr": "true", "tail": "20"},
         )
         
-        if result.returncode == 0:
-            logs = result.stdout.lower()
-            error_count = logs.count("error")
-            exception_count = logs.count("exception") + logs.count("traceback")
+        if response.status_code == 200:
+            # One case-insensitive pass over the raw bytes instead of
+            # lower-casing the logs and scanning them once per keyword
+            logs = _demux_docker_stream(response.content)
+            counts = Counter(match.lower() for match in LOG_PROBLEM_PATTERN.findall(logs))
+            error_count = counts[b"error"]
+            exception_count = counts[b"exception"] + counts[b"traceback"]
             
             if error_count == 0 and exception_count == 0:
-                print_status("No recent errors in application logs", "SUCCESS")
+                print_status("No recent errors in application logs", "SUCCESS", out=out)
                 return True
             elif error_count <= 2 and exception_count == 0:
-                print_status(f"Minor errors in logs ({error_count} errors)", "WARNING")
+                print_status(f"Minor errors in logs ({error_count} errors)", "WARNING", out=out)
                 return True
             else:
-                print_status(f"Multiple errors in logs ({error_count} errors, {exception_count} exceptions)", "ERROR")
+                print_status(f"Multiple errors in logs ({error_count} errors, {exception_count} exceptions)", "ERROR", out=out)
                 return False
         else:
-            print_status("Could not retrieve logs", "WARNING")
+            print_status("Could not retrieve logs", "WARNING", out=out)
             return True
             
     except Exception as e:
-        print_status(f"Log check failed: {e}", "WARNING")
+        print_status(f"Log check failed: {e}", "WARNING", out=out)
         return True
 
+def _run_check(check_func):
+    """Run a check, returning its result and the status lines it printed."""
+    out = io.StringIO()
+    try:
+        result = check_func(out)
+    except Exception as e:
+        print_status(f"Check failed with exception: {e}", "ERROR", out=out)
+        result = False
+    return result, out.getvalue()
+
 def main():
     """Run comprehensive health checks."""
     print("[HEALTH CHECK] Syria GPT Health Check")
@@ -188,16 +289,21 @@ def main():
     
     results = []
     
-    for check_name, check_func in checks:
-        print(f"\n[CHECK] {check_name}")
-        print("-" * 30)
-        
-        try:
-            result = check_func()
-            results.append((check_name, result))
-        except Exception as e:
-            print_status(f"Check failed with exception: {e}", "ERROR")
-            results.append((check_name, False))
+    # The checks are independent and mostly wait on HTTP or the Docker API, so
+    # they run concurrently; each buffers its output, printed in the order above
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [executor.submit(_run_check, check_func) for _, check_func in checks]
+            for (check_name, _), future in zip(checks, futures):
+                result, output = future.result()
+                print(f"\n[CHECK] {check_name}")
+                print("-" * 30)
+                print(output, end="")
+                results.append((check_name, result))
+    finally:
+        _save_cache()
+        _session.close()
+        _docker.close()
     
     # Summary
     print("\n" + "=" * 50)
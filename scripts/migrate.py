@@ -10,12 +10,12 @@ import sys
 import os
 from pathlib import Path
 
-# Add current directory to Python path
-sys.path.insert(0, str(Path(__file__).parent))
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 if __name__ == "__main__":
     try:
-        from utils.migration_utility import main
+        from shared.utils.migration_utility import main
         main()
     except ImportError as e:
         print(f"Failed to import migration utility: {e}")
@@ -30,8 +30,9 @@ logger = logging.getLogger(__name__)
 class SetupManager:
     """Manages the complete setup process for Syria GPT."""
     
-    def __init__(self):
+    def __init__(self, verify_dependencies: bool = False):
         self.project_root = Path(__file__).parent
+        self.verify_dependencies = verify_dependencies
         self.errors = []
         self.warnings = []
         
@@ -47,31 +48,27 @@ class SetupManager:
             logger.info(f"[INFO] {message}")
     
     def run_command(self, command: List[str], description: str, 
-                   cwd: Optional[Path] = None, timeout: int = 300) -> bool:
+                   cwd: Optional[Path] = None, timeout: int = 300,
+                   env: Optional[Dict[str, str]] = None) -> bool:
         """Run a command and handle errors."""
         try:
             self.log_status(f"Running: {description}")
             self.log_status(f"Command: {' '.join(command)}")
             
+            # Output streams straight to the terminal, so long installs and
+            # builds show progress as they run instead of after they finish
             result = subprocess.run(
                 command,
                 cwd=cwd or self.project_root,
-                capture_output=True,
-                text=True,
-                timeout=timeout
+                timeout=timeout,
+                env=env
             )
             
             if result.returncode == 0:
                 self.log_status(f"SUCCESS: {description}")
-                if result.stdout.strip():
-                    logger.debug(f"Output: {result.stdout.strip()}")
                 return True
             else:
                 self.log_status(f"FAILED: {description} (exit code: {result.returncode})", "error")
-                if result.stderr:
-                    logger.error(f"Error output: {result.stderr}")
-                if result.stdout:
-                    logger.error(f"Standard output: {result.stdout}")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -124,24 +121,20 @@ class SetupManager:
         else:
             self.log_status("No virtual environment detected - consider using one", "warning")
         
-        # Upgrade pip
-        if not self.run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], 
-                               "Upgrading pip"):
-            return False
-        
-        # Install requirements
+        # Upgrade pip and install requirements in a single pip run
         requirements_file = self.project_root / "requirements.txt"
         if requirements_file.exists():
-            if not self.run_command([sys.executable, "-m", "pip", "install", "-r", str(requirements_file)], 
-                                   "Installing Python dependencies"):
+            if not self.run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip",
+                                    "-r", str(requirements_file)], 
+                                   "Upgrading pip and installing Python dependencies"):
                 return False
         else:
             self.log_status("Requirements file not found", "error")
             return False
         
         # Verify installation
-        if not self.run_command([sys.executable, "-m", "pip", "check"], 
-                               "Checking dependency compatibility"):
+        if self.verify_dependencies and not self.run_command([sys.executable, "-m", "pip", "check"], 
+                                                             "Checking dependency compatibility"):
             self.log_status("Some dependency conflicts exist", "warning")
         
         return True
@@ -203,12 +196,11 @@ FRONTEND_URL=http://localhost:3000
         # Stop any existing containers
         self.run_command(["docker-compose", "down"], "Stopping existing containers")
         
-        # Build containers
-        if not self.run_command(["docker-compose", "build"], "Building Docker containers", timeout=600):
-            return False
-        
-        # Start containers
-        if not self.run_command(["docker-compose", "up", "-d"], "Starting Docker containers"):
+        # Build and start containers in one compose run, so containers whose
+        # images are ready start while the app image builds with BuildKit
+        build_env = {**os.environ, "COMPOSE_DOCKER_CLI_BUILD": "1", "DOCKER_BUILDKIT": "1"}
+        if not self.run_command(["docker-compose", "up", "-d", "--build"],
+                               "Building and starting Docker containers", timeout=600, env=build_env):
             return False
         
         # Wait for containers to be ready
@@ -408,6 +400,7 @@ Usage: python setup.py [options]
 
 Options:
   --help    Show this help message
+  --verify  Run pip check after installing dependencies
   
 This script will:
   1. Check system prerequisites
@@ -425,7 +418,7 @@ Requirements:
         """)
         return 0
     
-    setup_manager = SetupManager()
+    setup_manager = SetupManager(verify_dependencies="--verify" in sys.argv[1:])
     
     try:
         success = setup_manager.run_setup()
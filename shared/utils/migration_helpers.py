@@ -31,7 +31,7 @@ def add_index_if_not_exists(table_name: str, column_names: List[str],
     # Check if index exists
     connection = op.get_bind()
     inspector = sa.inspect(connection)
-    existing_indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    existing_indexes = {idx['name'] for idx in inspector.get_indexes(table_name)}
     
     if index_name not in existing_indexes:
         op.create_index(index_name, table_name, column_names, unique=unique)
@@ -53,7 +53,7 @@ def drop_index_if_exists(index_name: str, table_name: Optional[str] = None):
     try:
         if table_name:
             inspector = sa.inspect(connection)
-            existing_indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+            existing_indexes = {idx['name'] for idx in inspector.get_indexes(table_name)}
             
             if index_name in existing_indexes:
                 op.drop_index(index_name, table_name)
@@ -85,7 +85,7 @@ def add_column_if_not_exists(table_name: str, column_name: str, column_type,
     """
     connection = op.get_bind()
     inspector = sa.inspect(connection)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    columns = {col['name'] for col in inspector.get_columns(table_name)}
     
     if column_name not in columns:
         column_kwargs = {
@@ -112,7 +112,7 @@ def drop_column_if_exists(table_name: str, column_name: str):
     """
     connection = op.get_bind()
     inspector = sa.inspect(connection)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    columns = {col['name'] for col in inspector.get_columns(table_name)}
     
     if column_name in columns:
         op.drop_column(table_name, column_name)
@@ -131,7 +131,7 @@ def rename_table_if_exists(old_name: str, new_name: str):
     """
     connection = op.get_bind()
     inspector = sa.inspect(connection)
-    table_names = inspector.get_table_names()
+    table_names = set(inspector.get_table_names())
     
     if old_name in table_names:
         if new_name not in table_names:
@@ -163,7 +163,7 @@ def add_foreign_key_if_not_exists(constraint_name: str, source_table: str,
     connection = op.get_bind()
     inspector = sa.inspect(connection)
     existing_fks = inspector.get_foreign_keys(source_table)
-    existing_names = [fk['name'] for fk in existing_fks]
+    existing_names = {fk['name'] for fk in existing_fks}
     
     if constraint_name not in existing_names:
         op.create_foreign_key(
@@ -186,7 +186,7 @@ def drop_foreign_key_if_exists(constraint_name: str, table_name: str):
     connection = op.get_bind()
     inspector = sa.inspect(connection)
     existing_fks = inspector.get_foreign_keys(table_name)
-    existing_names = [fk['name'] for fk in existing_fks]
+    existing_names = {fk['name'] for fk in existing_fks}
     
     if constraint_name in existing_names:
         op.drop_constraint(constraint_name, table_name, type_='foreignkey')
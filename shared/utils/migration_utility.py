@@ -8,23 +8,26 @@ for database management.
 Author: Syria GPT
 """
 
+import json
 import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import logging
 
 # Add project root to path for imports
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from alembic.config import Config
 from alembic import command
 from alembic.script import ScriptDirectory
 from alembic.runtime.migration import MigrationContext
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 try:
@@ -38,13 +41,25 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Model metadata is fixed once the models are imported
+_MODEL_TABLE_NAMES = frozenset(Base.metadata.tables)
+
+_REVISION_RE = re.compile(r'^revision\s*(?::\s*\w+\s*)?=\s*[\'"]([^\'"]+)', re.M)
+
+
+def _extract_revision(migration_file: Path) -> Optional[str]:
+    """Extract the revision identifier from a migration file."""
+    match = _REVISION_RE.search(migration_file.read_text(encoding="utf-8"))
+    return match.group(1) if match else None
+
 
 class MigrationUtility:
     """Database migration utility class."""
     
     def __init__(self, alembic_cfg_path: str = "alembic.ini"):
         """Initialize the migration utility."""
-        self.project_root = Path(__file__).parent.parent
+        self.project_root = project_root
+        self.revision_cache_path = self.project_root / ".migrate_cache.json"
         self.alembic_cfg_path = self.project_root / alembic_cfg_path
         
         if not self.alembic_cfg_path.exists():
@@ -56,6 +71,22 @@ class MigrationUtility:
         if hasattr(settings, 'DATABASE_URL'):
             self.alembic_cfg.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
     
+    def _run_command(self, alembic_command, *args, sql: bool = False, **kwargs) -> None:
+        """Run an Alembic command on a connection from the shared engine pool."""
+        if sql:
+            # Offline mode only renders SQL and never touches the database
+            alembic_command(self.alembic_cfg, *args, sql=sql, **kwargs)
+            return
+        
+        # Alembic manages the transaction itself, which autocommit_block() in
+        # migrations such as CREATE INDEX CONCURRENTLY depends on
+        with engine.connect() as connection:
+            self.alembic_cfg.attributes["connection"] = connection
+            try:
+                alembic_command(self.alembic_cfg, *args, sql=sql, **kwargs)
+            finally:
+                self.alembic_cfg.attributes.pop("connection", None)
+    
     def get_current_revision(self) -> Optional[str]:
         """Get the current database revision."""
         try:
@@ -103,8 +134,8 @@ class MigrationUtility:
         try:
             print(f"Creating migration: {message}")
             
-            command.revision(
-                self.alembic_cfg,
+            self._run_command(
+                command.revision,
                 message=message,
                 autogenerate=autogenerate,
                 sql=sql,
@@ -138,8 +169,8 @@ class MigrationUtility:
             current = self.get_current_revision()
             print(f"Upgrading from revision {current} to {revision}")
             
-            command.upgrade(
-                self.alembic_cfg,
+            self._run_command(
+                command.upgrade,
                 revision,
                 sql=sql,
                 tag=tag
@@ -170,8 +201,8 @@ class MigrationUtility:
             current = self.get_current_revision()
             print(f"Downgrading from revision {current} to {revision}")
             
-            command.downgrade(
-                self.alembic_cfg,
+            self._run_command(
+                command.downgrade,
                 revision,
                 sql=sql,
                 tag=tag
@@ -253,6 +284,90 @@ class MigrationUtility:
             print(f"[ERROR] Failed to show heads: {e}")
             return []
     
+    def check_migration_conflicts(self) -> bool:
+        """
+        Check migration files for duplicate revision identifiers.
+        
+        Parsed revisions are cached by file mtime, so unchanged files are
+        not re-read on subsequent runs. If the versions directory itself is
+        unchanged since the last clean run, the check is skipped entirely;
+        like any directory mtime this misses in-place edits that do not
+        replace the file, which generated revision IDs never need.
+        
+        Returns:
+            True if no conflicts were found, False otherwise
+        """
+        try:
+            script_location = self.alembic_cfg.get_main_option("script_location")
+            versions_dir = self.project_root / script_location / "versions"
+            
+            cache = self._load_revision_cache()
+            versions_mtime = versions_dir.stat().st_mtime_ns
+            if cache.get("versions_mtime") == versions_mtime:
+                revision_count = sum(1 for _, revision in cache["files"].values() if revision)
+                print(f"[SUCCESS] No migration conflicts found ({revision_count} revisions)")
+                return True
+            
+            cached_files = cache.get("files", {})
+            updated_cache = {}
+            stale_files = []
+            
+            for migration_file in sorted(versions_dir.glob("*.py")):
+                mtime = migration_file.stat().st_mtime_ns
+                cached = cached_files.get(str(migration_file))
+                if cached and cached[0] == mtime:
+                    updated_cache[str(migration_file)] = cached
+                else:
+                    updated_cache[str(migration_file)] = [mtime, None]
+                    stale_files.append(migration_file)
+            
+            # Only changed files are read; fan the reads out so their syscalls overlap
+            if stale_files:
+                with ThreadPoolExecutor(max_workers=min(32, len(stale_files))) as executor:
+                    for migration_file, revision in zip(
+                        stale_files, executor.map(_extract_revision, stale_files)
+                    ):
+                        updated_cache[str(migration_file)][1] = revision
+            
+            seen: Dict[str, Path] = {}
+            for path, (_, revision) in updated_cache.items():
+                migration_file = Path(path)
+                if revision is None:
+                    continue
+                if revision in seen:
+                    print(
+                        f"[ERROR] Duplicate revision {revision} in "
+                        f"{seen[revision].name} and {migration_file.name}"
+                    )
+                    return False
+                seen[revision] = migration_file
+            
+            # versions_mtime is only recorded after a clean run, so a failing
+            # check is always repeated in full
+            self._save_revision_cache({"versions_mtime": versions_mtime, "files": updated_cache})
+            print(f"[SUCCESS] No migration conflicts found ({len(seen)} revisions)")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to check migration conflicts: {e}")
+            print(f"[ERROR] Failed to check migration conflicts: {e}")
+            return False
+    
+    def _load_revision_cache(self) -> Dict[str, Any]:
+        """Load the revision cache, ignoring a missing, corrupt or outdated file."""
+        try:
+            cache = json.loads(self.revision_cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache.get("files"), dict) else {}
+    
+    def _save_revision_cache(self, cache: Dict[str, Any]) -> None:
+        """Persist the revision cache; failures only cost a re-parse next run."""
+        try:
+            self.revision_cache_path.write_text(json.dumps(cache), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to write revision cache: {e}")
+    
     def init_database(self) -> bool:
         """Initialize database with current schema."""
         try:
@@ -319,14 +434,13 @@ class MigrationUtility:
             # This is a simplified validation - in production you might want
             # to compare actual table structure with model definitions
             with engine.connect() as conn:
-                # Try to query each table defined in models
-                for table in Base.metadata.tables.values():
-                    try:
-                        result = conn.execute(text(f"SELECT 1 FROM {table.name} LIMIT 1"))
-                        result.close()
-                    except Exception as e:
-                        print(f"[ERROR] Table {table.name} validation failed: {e}")
-                        return False
+                existing_tables = set(inspect(conn).get_table_names())
+            
+            missing_tables = _MODEL_TABLE_NAMES - existing_tables
+            if missing_tables:
+                for table_name in sorted(missing_tables):
+                    print(f"[ERROR] Table {table_name} validation failed: table does not exist")
+                return False
                         
             print("[SUCCESS] Database schema validation passed")
             return True
@@ -353,14 +467,17 @@ class MigrationUtility:
             
             # Use pg_dump for PostgreSQL backup
             if "postgresql" in settings.DATABASE_URL.lower():
-                cmd = f"pg_dump {settings.DATABASE_URL} > {backup_path}"
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                # pg_dump writes the file itself, so no shell is needed for the
+                # redirect; stderr flows straight to the console rather than
+                # being buffered in memory until the dump finishes
+                cmd = ["pg_dump", "--file", str(backup_path), settings.DATABASE_URL]
+                result = subprocess.run(cmd)
                 
                 if result.returncode == 0:
                     print(f"[SUCCESS] Database backed up to {backup_path}")
                     return True
                 else:
-                    print(f"[ERROR] pg_dump failed: {result.stderr}")
+                    print(f"[ERROR] pg_dump failed with exit code {result.returncode}")
                     return False
             else:
                 print("[ERROR] Backup only implemented for PostgreSQL databases")
@@ -407,7 +524,7 @@ def main():
     parser = argparse.ArgumentParser(description="Database Migration Utility")
     parser.add_argument("command", choices=[
         "create", "upgrade", "downgrade", "history", "current", "heads",
-        "init", "drop", "reset", "validate", "backup", "status"
+        "init", "drop", "reset", "validate", "backup", "status", "check"
     ], help="Migration command")
     
     parser.add_argument("-m", "--message", help="Migration message")
@@ -468,6 +585,9 @@ def main():
             migration_util.check_migrations_status()
             success = True
             
+        elif args.command == "check":
+            success = migration_util.check_migration_conflicts()
+            
         else:
             print(f"[ERROR] Unknown command: {args.command}")
             success = False
@@ -1,24 +1,31 @@
 #!/usr/bin/env python3
 """Test runner script for Syria GPT API."""
 
+import os
 import sys
-import subprocess
 import argparse
 from pathlib import Path
 
+import pytest
 
-def run_command(command: list, description: str) -> bool:
-    """Run a command and return success status."""
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def run_pytest(args: list, description: str) -> bool:
+    """Run pytest in this interpreter and return success status."""
     print(f"\n {description}")
     print("=" * 50)
     
-    try:
-        result = subprocess.run(command, check=True, cwd=Path(__file__).parent.parent)
+    # Match `python -m pytest` run from the project root
+    os.chdir(PROJECT_ROOT)
+    sys.path.insert(0, str(PROJECT_ROOT))
+    
+    exit_code = pytest.main(args)
+    if exit_code == 0:
         print(f"✅ {description} completed successfully")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed with exit code {e.returncode}")
-        return False
+    print(f"❌ {description} failed with exit code {int(exit_code)}")
+    return False
 
 
 def main():
@@ -32,8 +39,8 @@ def main():
     
     args = parser.parse_args()
     
-    # Base pytest command
-    cmd = ["python", "-m", "pytest"]
+    # pytest arguments
+    cmd = []
     
     # Add verbosity
     if args.verbose:
@@ -59,7 +66,7 @@ def main():
         description = "Running all tests"
     
     # Run tests
-    success = run_command(cmd, description)
+    success = run_pytest(cmd, description)
     
     if success:
         print("\n🎉 All tests passed!")
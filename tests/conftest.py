@@ -72,11 +72,9 @@ def password_service() -> PasswordService:
 
 
 @pytest.fixture
-def token_service(test_db: Session) -> TokenService:
+def token_service() -> TokenService:
     """Create token service instance."""
-    from infrastructure.database.repositories.password_reset_repository import PasswordResetRepository
-    password_reset_repo = PasswordResetRepository(test_db)
-    return TokenService(password_reset_repo)
+    return TokenService()
 
 
 @pytest.fixture
@@ -15,7 +15,7 @@ class TestPasswordService:
         assert hashed is not None
         assert hashed != password
         assert len(hashed) > 50  # bcrypt hashes are long
-        assert hashed.startswith("$2b$")  # bcrypt identifier
+        assert hashed.startswith("$bcrypt-sha256$")  # SHA-256 pre-hashed bcrypt identifier
     
     def test_verify_password_correct(self, password_service: PasswordService):
         """Test password verification with correct password."""
@@ -44,4 +44,30 @@ class TestPasswordService:
         
         # But both should verify correctly
         assert password_service.verify_password(password, hash1) == True
-        assert password_service.verify_password(password, hash2) == True
\ No newline at end of file
+        assert password_service.verify_password(password, hash2) == True
+    
+    def test_long_passwords_not_truncated(self, password_service: PasswordService):
+        """Test that passwords differing after bcrypt's 72-byte limit do not match."""
+        password = "a" * 72
+        hashed = password_service.hash_password(password + "1")
+        
+        assert password_service.verify_password(password + "1", hashed) == True
+        assert password_service.verify_password(password + "2", hashed) == False
+    
+    def test_legacy_bcrypt_hash(self, password_service: PasswordService):
+        """Test that plain bcrypt hashes still verify and are flagged for rehashing."""
+        password = "testpassword123"
+        legacy_hash = password_service.pwd_context.hash(password, scheme="bcrypt")
+        
+        assert password_service.verify_password(password, legacy_hash) == True
+        assert password_service.needs_rehash(legacy_hash) == True
+        assert password_service.needs_rehash(password_service.hash_password(password)) == False
+    
+    @pytest.mark.asyncio
+    async def test_async_hash_and_verify(self, password_service: PasswordService):
+        """Test thread-offloaded hashing and verification."""
+        password = "testpassword123"
+        hashed = await password_service.hash_password_async(password)
+        
+        assert await password_service.verify_password_async(password, hashed) == True
+        assert await password_service.verify_password_async("wrongpassword", hashed) == False
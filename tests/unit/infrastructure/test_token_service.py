@@ -2,7 +2,7 @@
 
 import pytest
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from infrastructure.services import TokenService
 
 
@@ -51,6 +51,25 @@ class TestTokenService:
         assert payload["sub"] == user_id
         assert payload["type"] == "refresh"
         assert "exp" in payload
+
+    def test_refresh_token_carries_token_version(self, token_service: TokenService):
+        """Test refresh tokens embed the user's token version as the ver claim."""
+        token = token_service.create_refresh_token("user123", 3)
+
+        payload = token_service.verify_token(token, "refresh")
+        assert payload is not None
+        assert payload["ver"] == 3
+
+    def test_create_token_pair(self, token_service: TokenService):
+        """Test the sign-in token pair verifies as an access and a refresh token."""
+        access_token, refresh_token = token_service.create_token_pair("user123", 2)
+
+        access_payload = token_service.verify_token(access_token, "access")
+        assert access_payload["sub"] == "user123"
+        refresh_payload = token_service.verify_token(refresh_token, "refresh")
+        assert refresh_payload["sub"] == "user123"
+        assert refresh_payload["ver"] == 2
+        assert refresh_payload["exp"] > access_payload["exp"]
     
     def test_verify_token_invalid(self, token_service: TokenService):
         """Test verifying invalid token."""
@@ -102,4 +121,36 @@ class TestTokenService:
         decoded_user_id = token_service.verify_verification_token(token)
         assert decoded_user_id == user_id    
 
-    
\ No newline at end of file
+    
+    def test_verify_password_reset_token(self, token_service: TokenService):
+        """Test verifying a password reset token."""
+        user_id = uuid.uuid4()
+        token = token_service.create_password_reset_token(user_id)
+
+        assert token_service.verify_password_reset_token(token) == str(user_id)
+        # Access tokens must not be accepted as reset tokens
+        access_token = token_service.create_access_token({"sub": str(user_id)})
+        assert token_service.verify_password_reset_token(access_token) is None
+
+    def test_password_reset_token_uses_given_expiry(self, token_service: TokenService):
+        """Test the reset token expires at the same instant as its stored record."""
+        expires_at = (datetime.now(timezone.utc) + timedelta(minutes=30)).replace(microsecond=0)
+        token = token_service.create_password_reset_token(uuid.uuid4(), expires_at=expires_at)
+
+        payload = token_service.verify_token(token, "password_reset")
+        assert payload["exp"] == int(expires_at.timestamp())
+
+    def test_verify_2fa_token(self, token_service: TokenService):
+        """Test 2FA token round trip and tamper detection."""
+        user_id = str(uuid.uuid4())
+        token = token_service.create_2fa_token(user_id)
+
+        payload = token_service.verify_2fa_token(token)
+        assert payload is not None
+        assert payload["sub"] == user_id
+
+        encoded_payload, signature = token.split(".")
+        tampered = token_service.create_2fa_token(str(uuid.uuid4())).split(".")[0]
+        assert token_service.verify_2fa_token(f"{tampered}.{signature}") is None
+        assert token_service.verify_2fa_token("invalid.token.here") is None
+        assert token_service.verify_2fa_token("garbage") is None
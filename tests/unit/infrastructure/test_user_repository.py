@@ -31,6 +31,15 @@ class TestUserRepository:
         assert user.is_active == True
         assert user.id is not None
     
+    async def test_create_if_absent(self, user_repository: UserRepositoryImpl):
+        """Test creating a user only when the email is not taken, ignoring case."""
+        user = await user_repository.create_if_absent({"email": "unique@example.com"})
+        
+        assert user is not None
+        assert user.email == "unique@example.com"
+        assert user.token_version == 0
+        assert await user_repository.create_if_absent({"email": "Unique@Example.com"}) is None
+    
     async def test_get_by_id(self, user_repository: UserRepositoryImpl, created_user: User):
         """Test getting user by ID."""
         user = await created_user
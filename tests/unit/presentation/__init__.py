@@ -0,0 +1 @@
+"""Presentation unit tests package."""
\ No newline at end of file
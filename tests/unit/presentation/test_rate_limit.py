@@ -0,0 +1,119 @@
+"""Tests for auth route rate limiting."""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from application import AuthApplicationService
+from presentation import rate_limit
+from presentation.rate_limit import TokenBucketLimiter
+from presentation.api.controllers import auth_router
+from presentation.dependencies import get_auth_service
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucketLimiter:
+    """Test Token Bucket Limiter."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch) -> FakeClock:
+        """Drive the limiter's clock by hand."""
+        clock = FakeClock()
+        monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+        return clock
+
+    def test_allows_burst_then_rejects(self, clock: FakeClock):
+        """Test a fresh bucket allows `capacity` requests and then rejects."""
+        limiter = TokenBucketLimiter(capacity=3, refill_per_second=1)
+
+        assert [limiter.allow("client") for _ in range(4)] == [True, True, True, False]
+
+    def test_refills_over_time(self, clock: FakeClock):
+        """Test tokens come back at the refill rate."""
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=0.5)
+        assert limiter.allow("client") and limiter.allow("client")
+        assert not limiter.allow("client")
+
+        clock.now += 1
+        assert not limiter.allow("client")  # only half a token so far
+        clock.now += 1
+        assert limiter.allow("client")
+        assert not limiter.allow("client")
+
+    def test_refill_is_capped_at_capacity(self, clock: FakeClock):
+        """Test an idle bucket never holds more than `capacity` tokens."""
+        limiter = TokenBucketLimiter(capacity=2, refill_per_second=1)
+        limiter.allow("client")
+
+        clock.now += 3600
+        assert [limiter.allow("client") for _ in range(3)] == [True, True, False]
+
+    def test_keys_are_independent(self, clock: FakeClock):
+        """Test one caller's empty bucket does not limit another."""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0)
+
+        assert limiter.allow("a")
+        assert not limiter.allow("a")
+        assert limiter.allow("b")
+
+    def test_evicts_least_recently_used_key(self, clock: FakeClock):
+        """Test the oldest bucket is dropped once `max_keys` is reached."""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0, max_keys=2)
+        limiter.allow("a")
+        limiter.allow("b")
+        limiter.allow("a")  # "a" is now the most recently used; "b" the oldest
+
+        limiter.allow("c")  # evicts "b"
+        assert limiter.allow("b")  # "b" starts over with a full bucket
+        assert not limiter.allow("c")
+
+
+class TestEnforceRateLimit:
+    """Test rate limiting on auth routes."""
+
+    @pytest.fixture
+    def auth_service(self) -> Mock:
+        """Create an auth service whose sign-in always fails."""
+        mock = Mock(spec=AuthApplicationService)
+        mock.authenticate_user = AsyncMock(side_effect=ValueError("Invalid email or password"))
+        return mock
+
+    def _client(self, auth_service: Mock) -> TestClient:
+        """Mount the auth router on a bare app, without create_app()."""
+        app = FastAPI()
+        app.include_router(auth_router)
+        app.dependency_overrides[get_auth_service] = lambda: auth_service
+        return TestClient(app)
+
+    def test_signin_returns_429_when_bucket_is_empty(self, auth_service: Mock):
+        """Test sign-in is rejected with 429 once the caller's bucket is used up."""
+        client = self._client(auth_service)
+        client.app.state.rate_limiter = TokenBucketLimiter(capacity=2, refill_per_second=0)
+        credentials = {"email": "test@example.com", "password": "wrongpassword"}
+
+        assert client.post("/auth/signin", json=credentials).status_code == 401
+        assert client.post("/auth/signin", json=credentials).status_code == 401
+        response = client.post("/auth/signin", json=credentials)
+
+        assert response.status_code == 429
+        assert auth_service.authenticate_user.await_count == 2
+
+    def test_falls_back_to_default_limiter(self, auth_service: Mock, monkeypatch):
+        """Test an app without its own limiter uses the process-wide one."""
+        limiter = TokenBucketLimiter(capacity=1, refill_per_second=0)
+        monkeypatch.setattr(rate_limit, "get_default_rate_limiter", lambda: limiter)
+        client = self._client(auth_service)
+        credentials = {"email": "test@example.com", "password": "wrongpassword"}
+
+        assert client.post("/auth/signin", json=credentials).status_code == 401
+        assert client.post("/auth/signin", json=credentials).status_code == 429